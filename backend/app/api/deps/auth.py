@@ -1,12 +1,18 @@
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
 from typing import Annotated, Callable
 from collections.abc import Callable
 from typing import Any
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.core.security import decode_token
-from app.db.session import get_session
+from app.db.session import AsyncSessionLocal, get_session
 from app.models.user import User, UserRole
 from app.schemas.auth import TokenPayload
 from app.loader import APP_LOGGER
@@ -14,11 +20,64 @@ from app.loader import APP_LOGGER
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+@dataclass(slots=True, frozen=True)
+class AuthUser:
+    """
+    Лёгкое представление текущего пользователя.
+
+    Содержит только то, что нужно для авторизации и фильтрации по владельцу.
+    Полный ORM-объект — через get_current_user_full.
+    """
+
+    id: int
+    email: str
+    role: UserRole
+    is_blocked: bool
+
+
+# Собираем запрос один раз: скомпилированный SQL берётся из кеша движка
+USER_BY_ID = select(User.id, User.email, User.role, User.is_blocked).where(
+    User.id == bindparam("user_id")
+)
+
+# sha256(token)[:16] -> (момент истечения токена, пользователь)
+_user_cache: TTLCache[bytes, tuple[float, AuthUser]] = TTLCache(
+    maxsize=settings.auth_cache_maxsize,
+    ttl=settings.auth_cache_ttl_seconds,
+)
+
+
+def _cache_key(token: str) -> bytes:
+    """Короткий ключ кеша: сам токен не храним, память на запись ограничена."""
+    return hashlib.sha256(token.encode()).digest()[:16]
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """Сбрасывает закешированные токены пользователя (смена роли, блокировка)."""
+    for key, (_, user) in list(_user_cache.items()):
+        if user.id == user_id:
+            _user_cache.pop(key, None)
+
+
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    session: Annotated[AsyncSession, Depends(get_session)],
-) -> User:
-    """Возвращает текущего пользователя по access-токену."""
+) -> AuthUser:
+    """
+    Возвращает текущего пользователя по access-токену.
+
+    Недавно проверенные токены берутся из in-memory кеша без декодирования
+    и запроса в БД. При промахе пользователь читается в своей короткой
+    сессии: соединение возвращается в пул сразу после запроса, а не
+    держится до конца обработки и сериализации ответа.
+    """
+    cache_key = _cache_key(token)
+    cached = _user_cache.get(cache_key)
+    if cached is not None:
+        token_exp, user = cached
+        if token_exp > time.time():
+            return user
+        _user_cache.pop(cache_key, None)
+
     payload_data = decode_token(token)
     if payload_data is None:
         raise HTTPException(
@@ -33,54 +92,81 @@ async def get_current_user(
             detail="Невалидный токен",
         )
 
-    query = select(User).where(User.id == int(payload.sub))
-    result = await session.execute(query)
-    user = result.scalar_one_or_none()
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(USER_BY_ID, {"user_id": int(payload.sub)})
+        row = result.one_or_none()
 
-    if user is None:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Пользователь не найден",
         )
 
+    user = AuthUser(*row)
     if user.is_blocked:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Аккаунт заблокирован",
         )
 
+    token_exp = float(payload_data.get("exp") or time.time() + settings.auth_cache_ttl_seconds)
+    _user_cache[cache_key] = (token_exp, user)
     return user
 
 
+async def get_current_user_full(
+    auth_user: Annotated[AuthUser, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> User:
+    """Полный ORM-объект текущего пользователя (профиль, редактирование)."""
+    user = await session.get(User, auth_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Пользователь не найден",
+        )
+    return user
+
+
+class _RoleChecker:
+    """Зависимость FastAPI: пропускает пользователя только с разрешённой ролью."""
+
+    __slots__ = ("allowed",)
+
+    def __init__(self, allowed: frozenset[str]) -> None:
+        self.allowed = allowed
+
+    async def __call__(self, current_user: AuthUser = Depends(get_current_user)) -> AuthUser:
+        raw_role = current_user.role
+        current_role = raw_role.value if isinstance(raw_role, UserRole) else raw_role
+
+        if current_role not in self.allowed:
+            APP_LOGGER.warning(
+                "[role_required] access denied user_id=%s role=%s allowed=%s",
+                current_user.id,
+                current_role,
+                self.allowed,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Недостаточно прав",
+            )
+
+        if APP_LOGGER.isEnabledFor(logging.DEBUG):
+            APP_LOGGER.debug(
+                "[role_required] user_id=%s role=%s allowed=%s",
+                current_user.id,
+                current_role,
+                self.allowed,
+            )
+        return current_user
+
+
 def role_required(*roles: UserRole | str) -> Callable[..., Any]:
     """
     Проверка роли пользователя.
     Принимает и Enum, и строки ('admin', 'organizer').
     """
-
-    allowed_roles = {
-        r.value if isinstance(r, UserRole) else r
-        for r in roles
-    }
-
-    async def dependency(current_user: User = Depends(get_current_user)) -> User:
-      raw_role = current_user.role
-      current_role = raw_role.value if isinstance(raw_role, UserRole) else raw_role
-
-      APP_LOGGER.info(
-          f"[role_required] user_id={current_user.id} role={current_role} "
-          f"allowed={sorted(allowed_roles)}"
-      )
-
-      if current_role not in allowed_roles:
-          APP_LOGGER.warning(
-              f"[role_required] access denied user_id={current_user.id} "
-              f"role={current_role} allowed={sorted(allowed_roles)}"
-          )
-          raise HTTPException(
-              status_code=status.HTTP_403_FORBIDDEN,
-              detail="Недостаточно прав",
-          )
-      return current_user
-
-    return dependency
\ No newline at end of file
+    return _RoleChecker(
+        frozenset(r.value if isinstance(r, UserRole) else r for r in roles)
+    )
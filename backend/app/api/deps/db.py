@@ -0,0 +1,46 @@
+from collections.abc import Sequence
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
+
+ModelT = TypeVar("ModelT")
+
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+async def get_or_404(
+    session: AsyncSession,
+    model: type[ModelT],
+    obj_id: Any,
+    detail: str,
+    *,
+    options: Sequence[ORMOption] = (),
+) -> ModelT:
+    """
+    Достаёт объект по первичному ключу или отвечает 404.
+
+    session.get сначала смотрит в identity map сессии и только потом идёт в БД.
+    """
+    obj = await session.get(model, obj_id, options=options)
+    if obj is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail,
+        )
+    return obj
+
+
+def is_fk_violation(exc: IntegrityError, constraint: str) -> bool:
+    """
+    Проверяет, что IntegrityError — нарушение конкретного внешнего ключа.
+
+    SQLSTATE берём из адаптера драйвера, имя ограничения — из исходного
+    исключения asyncpg.
+    """
+    if getattr(exc.orig, "pgcode", None) != FOREIGN_KEY_VIOLATION:
+        return False
+    cause = getattr(exc.orig, "__cause__", None)
+    return getattr(cause, "constraint_name", None) == constraint
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def check_etag(
+    request: Request,
+    response: Response,
+    session: AsyncSession,
+    version_stmt: Select,
+) -> None:
+    """
+    Слабый ETag для списков, которые админка часто опрашивает.
+
+    version_stmt возвращает одну строку-«версию» выборки,
+    например (max(updated_at), count(*)) с теми же фильтрами, что и список.
+    Если клиент прислал тот же ETag в If-None-Match — отвечаем 304
+    без загрузки и сериализации самого списка.
+    """
+    row = (await session.execute(version_stmt)).one()
+    version = "-".join(
+        str(v.timestamp()) if isinstance(v, datetime) else str(v)
+        for v in row
+    )
+    etag = f'W/"{version}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (t.strip() for t in if_none_match.split(",")):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
@@ -0,0 +1,57 @@
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.api.deps.auth import AuthUser, role_required
+from app.db.session import get_session
+from app.models.event import Event
+from app.models.user import UserRole
+
+# Запросы загрузки события для управления собираются один раз при импорте:
+# на каждый запрос остаётся только подставить параметры
+EVENT_FOR_MANAGE = (
+    select(Event)
+    .options(joinedload(Event.category, innerjoin=True))
+    .where(Event.id == bindparam("event_id"))
+)
+OWNED_EVENT_FOR_MANAGE = EVENT_FOR_MANAGE.where(
+    Event.organizer_id == bindparam("user_id")
+)
+EVENT_EXISTS = select(Event.id).where(Event.id == bindparam("event_id"))
+
+
+async def get_owned_event(
+    event_id: int,
+    current_user: AuthUser = Depends(
+        role_required(UserRole.organizer, UserRole.admin)
+    ),
+    session: AsyncSession = Depends(get_session),
+) -> Event:
+    """
+    Зависимость FastAPI: событие (с категорией), которым пользователь может управлять.
+
+    Организатору — только своё событие, админу — любое. Права проверяются
+    в WHERE того же запроса; если строка не нашлась, дешёвым запросом
+    по id различаем 404 и 403. В пределах одного запроса FastAPI
+    вычисляет зависимость один раз, сколько бы раз её ни запросили.
+    """
+    if current_user.role == UserRole.admin:
+        event = await session.scalar(EVENT_FOR_MANAGE, {"event_id": event_id})
+    else:
+        event = await session.scalar(
+            OWNED_EVENT_FOR_MANAGE, {"event_id": event_id, "user_id": current_user.id}
+        )
+    if event is not None:
+        return event
+
+    exists = await session.scalar(EVENT_EXISTS, {"event_id": event_id})
+    if exists is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Событие не найдено",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Нельзя управлять чужим событием",
+    )
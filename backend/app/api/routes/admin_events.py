@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.api.deps.auth import role_required
+from app.api.deps.db import get_or_404
+from app.api.deps.etag import check_etag
 from app.db.session import get_session
 from app.models.event import Event, EventStatus
 from app.models.user import UserRole
-from app.schemas.event import EventModerationAction, EventRead
+from app.schemas.event import EVENT_LIST_ADAPTER, EventModerationAction, EventRead
+from app.services import event_cache
 
 router = APIRouter(
     prefix="/admin/events",
@@ -17,20 +21,36 @@ router = APIRouter(
 
 @router.get("/", response_model=list[EventRead])
 async def list_events_for_moderation(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     status_filter: EventStatus | None = Query(default=EventStatus.pending_moderation),
-) -> list[EventRead]:
+) -> Response:
     """
     Список событий для админа, по умолчанию — на модерации.
+
+    Отдаёт ETag; при совпадении If-None-Match — 304.
     """
-    stmt = select(Event)
+    conditions = []
     if status_filter is not None:
-        stmt = stmt.where(Event.status == status_filter)
+        conditions.append(Event.status == status_filter)
+
+    version_stmt = select(func.max(Event.updated_at), func.count()).where(*conditions)
+    await check_etag(request, response, session, version_stmt)
 
-    stmt = stmt.order_by(Event.created_at.desc())
+    stmt = (
+        select(Event)
+        .options(joinedload(Event.category, innerjoin=True))
+        .where(*conditions)
+        .order_by(Event.created_at.desc())
+    )
     result = await session.execute(stmt)
-    events = result.scalars().unique().all()
-    return [EventRead.model_validate(e) for e in events]
+    events = result.scalars().all()
+    body = EVENT_LIST_ADAPTER.dump_json(EVENT_LIST_ADAPTER.validate_python(events))
+    # заголовки ETag, выставленные check_etag, переносим в готовый ответ
+    return Response(
+        content=body, media_type="application/json", headers=response.headers
+    )
 
 
 @router.post("/{event_id}/publish", response_model=EventRead)
@@ -44,15 +64,13 @@ async def publish_event(
 
     Обычно из статуса pending_moderation, но админ может опубликовать и черновик.
     """
-    stmt = select(Event).where(Event.id == event_id)
-    result = await session.execute(stmt)
-    event = result.scalar_one_or_none()
-
-    if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Событие не найдено",
-        )
+    event = await get_or_404(
+        session,
+        Event,
+        event_id,
+        "Событие не найдено",
+        options=[joinedload(Event.category, innerjoin=True)],
+    )
 
     if event.status == EventStatus.published:
         raise HTTPException(
@@ -63,9 +81,8 @@ async def publish_event(
     event.status = EventStatus.published
     event.moderation_comment = body.moderation_comment if body else None
 
-    session.add(event)
     await session.commit()
-    await session.refresh(event)
+    event_cache.bump_version()
     return EventRead.model_validate(event)
 
 
@@ -78,15 +95,13 @@ async def reject_event(
     """
     Отклонение события с комментарием модератора.
     """
-    stmt = select(Event).where(Event.id == event_id)
-    result = await session.execute(stmt)
-    event = result.scalar_one_or_none()
-
-    if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Событие не найдено",
-        )
+    event = await get_or_404(
+        session,
+        Event,
+        event_id,
+        "Событие не найдено",
+        options=[joinedload(Event.category, innerjoin=True)],
+    )
 
     # Разрешаем отклонять только событие на модерации
     if event.status != EventStatus.pending_moderation:
@@ -95,10 +110,8 @@ async def reject_event(
             detail="Можно отклонить только событие в статусе 'на модерации'",
         )
 
-    # Нормализуем комментарий
-    comment = (body.moderation_comment or "").strip()
-    if not comment:
-        comment = "Событие отклонено модератором"
+    # Пустой комментарий (схема уже обрезала пробелы) заменяем стандартным
+    comment = body.moderation_comment or "Событие отклонено модератором"
 
     event.status = EventStatus.rejected
     event.moderation_comment = comment
@@ -107,9 +120,8 @@ async def reject_event(
     # from datetime import datetime as dt
     # event.moderated_at = dt.utcnow()
 
-    session.add(event)
     await session.commit()
-    await session.refresh(event)
+    event_cache.bump_version()
 
     return EventRead.model_validate(event)
 
@@ -123,15 +135,9 @@ async def delete_event_as_admin(
     """
     Полное удаление события админом.
     """
-    stmt = select(Event).where(Event.id == event_id)
-    result = await session.execute(stmt)
-    event = result.scalar_one_or_none()
-
-    if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Событие не найдено",
-        )
+    event = await get_or_404(session, Event, event_id, "Событие не найдено")
 
     await session.delete(event)
     await session.commit()
+    event_cache.bump_version()
+    event_cache.invalidate_rsvp_stats(event_id)
@@ -1,14 +1,16 @@
-from typing import List
+from collections.abc import Sequence
+from typing import Any, List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, desc, select
+from sqlalchemy import Update, desc, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
-from app.api.deps.auth import role_required
+from app.api.deps.auth import invalidate_user_cache, role_required
 from app.db.session import get_session
 from app.loader import APP_LOGGER
 from app.models.organizer_request import OrganizerRequest, OrganizerRequestStatus
 from app.models.user import User, UserRole
+from app.schemas.common import StrippedStr
 from app.schemas.organizer_request import OrganizerRequestRead
 
 router = APIRouter(
@@ -18,19 +20,48 @@ router = APIRouter(
 )
 
 class OrganizerRequestReject(BaseModel):
-    admin_comment: str = Field(
+    admin_comment: StrippedStr = Field(
         ...,
         min_length=3,
         max_length=2000,
         description="Причина отклонения заявки, видимая пользователю",
     )
+
+
+def _resolve_pending_request(request_id: int, **values: Any) -> Update:
+    """
+    UPDATE ... RETURNING для заявки в статусе pending.
+
+    Проверка статуса и запись решения делаются одним запросом.
+    """
+    return (
+        update(OrganizerRequest)
+        .where(
+            OrganizerRequest.id == request_id,
+            OrganizerRequest.status == OrganizerRequestStatus.pending,
+        )
+        .values(resolved_at=func.now(), **values)
+        .returning(OrganizerRequest)
+    )
+
+
+async def _ensure_request_exists(session: AsyncSession, request_id: int) -> None:
+    """Если UPDATE не затронул строк — отличаем «нет заявки» от «уже не pending»."""
+    stmt = select(OrganizerRequest.id).where(OrganizerRequest.id == request_id)
+    if await session.scalar(stmt) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Заявка не найдена",
+        )
+
+
 @router.get("/", response_model=List[OrganizerRequestRead])
 async def list_organizer_requests(
     session: AsyncSession = Depends(get_session),
     status_filter: OrganizerRequestStatus | None = Query(default=None),
     limit: int = Query(default=100, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-) -> list[OrganizerRequestRead]:
+) -> Sequence[OrganizerRequest]:
     """
     Список заявок на роль организатора.
 
@@ -43,15 +74,15 @@ async def list_organizer_requests(
 
     stmt = (
         select(OrganizerRequest)
-        .where(and_(*conditions) if conditions else True)
+        .where(*conditions)
         .order_by(desc(OrganizerRequest.created_at))
         .limit(limit)
         .offset(offset)
     )
 
     result = await session.execute(stmt)
-    rows = result.scalars().unique().all()
-    return [OrganizerRequestRead.model_validate(r) for r in rows]
+    rows = result.scalars().all()
+    return rows
 
 
 @router.post("/{request_id}/approve", response_model=OrganizerRequestRead)
@@ -64,48 +95,44 @@ async def approve_organizer_request(
 
     Меняет статус на approved и роль пользователя на organizer.
     """
-    stmt = select(OrganizerRequest).where(OrganizerRequest.id == request_id)
-    result = await session.execute(stmt)
-    req = result.scalar_one_or_none()
+    stmt = _resolve_pending_request(
+        request_id,
+        status=OrganizerRequestStatus.approved,
+        admin_comment=func.coalesce(
+            func.nullif(func.trim(OrganizerRequest.admin_comment), ""),
+            "Одобрено администратором",
+        ),
+    )
+    req = await session.scalar(stmt)
 
     if req is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Заявка не найдена",
-        )
-
-    if req.status != OrganizerRequestStatus.pending:
+        await _ensure_request_exists(session, request_id)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Можно одобрить только заявку в статусе pending",
         )
 
-    # Получаем пользователя
-    user_stmt = select(User).where(User.id == req.user_id)
-    user_res = await session.execute(user_stmt)
-    user = user_res.scalar_one_or_none()
+    # Меняем роль пользователя в той же транзакции
+    user_stmt = (
+        update(User)
+        .where(User.id == req.user_id)
+        .values(role=UserRole.organizer)
+        .returning(User.id)
+    )
+    user_id = await session.scalar(user_stmt)
 
-    if user is None:
+    if user_id is None:
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователь заявки не найден",
         )
 
-    req.status = OrganizerRequestStatus.approved
-    from datetime import datetime as dt
-
-    req.resolved_at = dt.utcnow()
-    req.admin_comment = (req.admin_comment or "").strip() or "Одобрено администратором"
-
-    # Меняем роль пользователя
-    user.role = UserRole.organizer
-
-    session.add_all([req, user])
     await session.commit()
-    await session.refresh(req)
+    invalidate_user_cache(user_id)
 
     APP_LOGGER.info(
-        f"[OrganizerRequest] approved id={req.id} user_id={user.id}"
+        "[OrganizerRequest] approved id=%s user_id=%s", req.id, user_id
     )
 
     return OrganizerRequestRead.model_validate(req)
@@ -122,31 +149,21 @@ async def reject_organizer_request(
 
     Меняет статус на rejected и сохраняет причину из admin_comment.
     """
-    stmt = select(OrganizerRequest).where(OrganizerRequest.id == request_id)
-    result = await session.execute(stmt)
-    req = result.scalar_one_or_none()
+    stmt = _resolve_pending_request(
+        request_id,
+        status=OrganizerRequestStatus.rejected,
+        admin_comment=payload.admin_comment,
+    )
+    req = await session.scalar(stmt)
 
     if req is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Заявка не найдена",
-        )
-
-    if req.status != OrganizerRequestStatus.pending:
+        await _ensure_request_exists(session, request_id)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Можно отклонить только заявку в статусе pending",
         )
 
-    from datetime import datetime as dt
-
-    req.status = OrganizerRequestStatus.rejected
-    req.resolved_at = dt.utcnow()
-    req.admin_comment = payload.admin_comment.strip()
-
-    session.add(req)
     await session.commit()
-    await session.refresh(req)
 
     APP_LOGGER.info(
         "[OrganizerRequest] rejected id=%s", req.id
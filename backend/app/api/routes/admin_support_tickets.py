@@ -1,22 +1,29 @@
-from typing import List
-from datetime import datetime as dt
+from collections.abc import Sequence
+from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, desc, select
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 
 from app.api.deps.auth import role_required
+from app.api.deps.db import is_fk_violation
 from app.db.session import get_session
 from app.loader import APP_LOGGER
 from app.models.support_ticket import (
     SupportTicket,
     SupportTicketStatus,
 )
-from app.models.user import UserRole
+from app.models.user import User, UserRole
 from app.schemas.support_ticket import (
+    TICKET_COLUMNS,
+    SupportTicketImport,
     SupportTicketRead,
     SupportTicketReply,
+    render_tickets,
 )
+from app.services import support_cache
 
 router = APIRouter(
     prefix="/admin/support-tickets",
@@ -24,6 +31,58 @@ router = APIRouter(
     dependencies=[Depends(role_required(UserRole.admin))],
 )
 
+# Имя FK support_ticket.user_id -> user.id по соглашению Postgres
+SUPPORT_TICKET_USER_FK = "support_ticket_user_id_fkey"
+
+# Сначала по статусу, внутри — новые сверху: порядок индекса
+# ix_support_ticket_status_created_at
+ADMIN_TICKETS = select(*TICKET_COLUMNS).order_by(
+    SupportTicket.status.asc(),
+    SupportTicket.created_at.desc(),
+)
+# То же вместе с автором — для экрана админки, где нужен пользователь.
+# Никогда не сочетать явный join() с joinedload() той же связи: получится
+# второй JOIN и декартово произведение. Присоединённые строки отдаём
+# в связь через contains_eager, а из пользователя берём только нужные поля.
+ADMIN_TICKETS_WITH_USER = (
+    select(SupportTicket)
+    .join(SupportTicket.user)
+    .options(
+        contains_eager(SupportTicket.user).load_only(
+            User.id, User.email, User.full_name
+        )
+    )
+    .order_by(
+        SupportTicket.status.asc(),
+        SupportTicket.created_at.desc(),
+    )
+)
+
+
+async def _update_ticket(
+    session: AsyncSession,
+    ticket_id: int,
+    **values: Any,
+) -> SupportTicket:
+    """
+    UPDATE ... RETURNING для обращения.
+
+    updated_at проставляет сама БД (now()), без предварительного SELECT.
+    """
+    stmt = (
+        update(SupportTicket)
+        .where(SupportTicket.id == ticket_id)
+        .values(updated_at=func.now(), **values)
+        .returning(SupportTicket)
+    )
+    ticket = await session.scalar(stmt)
+    if ticket is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Обращение не найдено",
+        )
+    return ticket
+
 
 @router.get("/", response_model=List[SupportTicketRead])
 async def list_tickets(
@@ -31,27 +90,67 @@ async def list_tickets(
     status_filter: SupportTicketStatus | None = Query(default=None),
     limit: int = Query(default=100, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-) -> list[SupportTicketRead]:
+) -> Response:
     """
-    Список обращений пользователей.
+    Список обращений пользователей: сначала по статусу, внутри — новые сверху.
 
     Можно фильтровать по статусу: open / answered / closed.
+    Готовый JSON кешируется на короткий TTL: повторные опросы
+    админки не ходят в БД, пока обращения не менялись.
     """
+    params = (status_filter, limit, offset)
+    body = support_cache.get_admin_list(params)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
+    version = support_cache.current_version()
     conditions = []
     if status_filter is not None:
         conditions.append(SupportTicket.status == status_filter)
 
-    stmt = (
-        select(SupportTicket)
-        .where(and_(*conditions) if conditions else True)
-        .order_by(desc(SupportTicket.created_at))
-        .limit(limit)
-        .offset(offset)
-    )
-
+    stmt = ADMIN_TICKETS.where(*conditions).limit(limit).offset(offset)
     result = await session.execute(stmt)
-    rows = result.scalars().unique().all()
-    return [SupportTicketRead.model_validate(t) for t in rows]
+    body = render_tickets(result.mappings().all())
+    support_cache.put_admin_list(version, params, body)
+    return Response(content=body, media_type="application/json")
+
+
+@router.post(
+    "/bulk",
+    response_model=List[SupportTicketRead],
+    status_code=status.HTTP_201_CREATED,
+)
+async def import_tickets(
+    payload: List[SupportTicketImport] = Body(..., min_length=1, max_length=1000),
+    session: AsyncSession = Depends(get_session),
+) -> Sequence[SupportTicket]:
+    """
+    Массовое создание обращений (перенос из другой системы).
+
+    Все строки уходят одним INSERT ... VALUES (...), (...) RETURNING,
+    а не отдельным запросом на каждое обращение.
+    """
+    try:
+        tickets = (
+            await session.scalars(
+                insert(SupportTicket).returning(SupportTicket),
+                [item.model_dump() for item in payload],
+            )
+        ).all()
+        await session.commit()
+    except IntegrityError as exc:
+        await session.rollback()
+        if is_fk_violation(exc, SUPPORT_TICKET_USER_FK):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Указан несуществующий пользователь",
+            ) from exc
+        raise
+    support_cache.bump_version()
+
+    APP_LOGGER.info("[SupportTicket] imported count=%s", len(tickets))
+
+    return tickets
 
 
 @router.post("/{ticket_id}/reply", response_model=SupportTicketRead)
@@ -65,26 +164,17 @@ async def reply_ticket(
 
     Статус становится answered.
     """
-    stmt = select(SupportTicket).where(SupportTicket.id == ticket_id)
-    result = await session.execute(stmt)
-    ticket = result.scalar_one_or_none()
-
-    if ticket is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Обращение не найдено",
-        )
-
-    ticket.admin_reply = payload.reply.strip()
-    ticket.status = SupportTicketStatus.answered
-    ticket.updated_at = dt.utcnow()
-
-    session.add(ticket)
+    ticket = await _update_ticket(
+        session,
+        ticket_id,
+        admin_reply=payload.reply,
+        status=SupportTicketStatus.answered,
+    )
     await session.commit()
-    await session.refresh(ticket)
+    support_cache.bump_version()
 
     APP_LOGGER.info(
-        f"[SupportTicket] replied id={ticket.id}"
+        "[SupportTicket] replied id=%s", ticket.id
     )
 
     return SupportTicketRead.model_validate(ticket)
@@ -98,25 +188,12 @@ async def close_ticket(
     """
     Закрытие обращения администратором.
     """
-    stmt = select(SupportTicket).where(SupportTicket.id == ticket_id)
-    result = await session.execute(stmt)
-    ticket = result.scalar_one_or_none()
-
-    if ticket is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Обращение не найдено",
-        )
-
-    ticket.status = SupportTicketStatus.closed
-    ticket.updated_at = dt.utcnow()
-
-    session.add(ticket)
+    ticket = await _update_ticket(session, ticket_id, status=SupportTicketStatus.closed)
     await session.commit()
-    await session.refresh(ticket)
+    support_cache.bump_version()
 
     APP_LOGGER.info(
-        f"[SupportTicket] closed id={ticket.id}"
+        "[SupportTicket] closed id=%s", ticket.id
     )
 
     return SupportTicketRead.model_validate(ticket)
@@ -129,15 +206,16 @@ async def delete_support_ticket(
     """
     Удаление обращения поддержки администратором.
     """
-    stmt = select(SupportTicket).where(SupportTicket.id == ticket_id)
-    result = await session.execute(stmt)
-    ticket = result.scalar_one_or_none()
-
-    if ticket is None:
+    deleted_id = await session.scalar(
+        delete(SupportTicket)
+        .where(SupportTicket.id == ticket_id)
+        .returning(SupportTicket.id)
+    )
+    if deleted_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Обращение не найдено",
         )
 
-    await session.delete(ticket)
-    await session.commit()
\ No newline at end of file
+    await session.commit()
+    support_cache.bump_version()
\ No newline at end of file
@@ -1,14 +1,16 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, or_, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps.auth import role_required
+from app.api.deps.auth import invalidate_user_cache, role_required
+from app.api.deps.db import get_or_404
+from app.api.deps.etag import check_etag
 from app.db.session import get_session
 from app.loader import APP_LOGGER
 from app.models.user import User, UserRole
-from app.schemas.user import UserRead, UserRoleUpdate, UserBlockUpdate
+from app.schemas.user import USER_LIST_ADAPTER, UserRead, UserRoleUpdate, UserBlockUpdate
 
 router = APIRouter(
     prefix="/admin/users",
@@ -19,6 +21,8 @@ router = APIRouter(
 
 @router.get("/", response_model=List[UserRead])
 async def list_users(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     role: UserRole | None = Query(default=None),
     is_blocked: bool | None = Query(default=None),
@@ -29,7 +33,7 @@ async def list_users(
     ),
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-) -> list[UserRead]:
+) -> Response:
     """
     Список пользователей для админа.
 
@@ -37,6 +41,8 @@ async def list_users(
     - role: admin / organizer / user
     - is_blocked: true/false
     - q: поиск по email / full_name
+
+    Отдаёт ETag; при совпадении If-None-Match — 304.
     """
     conditions = []
 
@@ -55,17 +61,24 @@ async def list_users(
             )
         )
 
+    version_stmt = select(func.max(User.updated_at), func.count()).where(*conditions)
+    await check_etag(request, response, session, version_stmt)
+
     stmt = (
         select(User)
-        .where(and_(*conditions) if conditions else True)
+        .where(*conditions)
         .order_by(User.created_at.desc())
         .limit(limit)
         .offset(offset)
     )
 
     result = await session.execute(stmt)
-    users = result.scalars().unique().all()
-    return [UserRead.model_validate(u) for u in users]
+    users = result.scalars().all()
+    body = USER_LIST_ADAPTER.dump_json(USER_LIST_ADAPTER.validate_python(users))
+    # заголовки ETag, выставленные check_etag, переносим в готовый ответ
+    return Response(
+        content=body, media_type="application/json", headers=response.headers
+    )
 
 
 @router.patch("/{user_id}/role", response_model=UserRead)
@@ -79,15 +92,7 @@ async def update_user_role(
 
     Нельзя понизить/изменить свою собственную роль через этот эндпоинт.
     """
-    stmt = select(User).where(User.id == user_id)
-    result = await session.execute(stmt)
-    user = result.scalar_one_or_none()
-
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Пользователь не найден",
-        )
+    user = await get_or_404(session, User, user_id, "Пользователь не найден")
 
     old_role = user.role
     new_role = payload.role
@@ -97,12 +102,14 @@ async def update_user_role(
 
     user.role = new_role
 
-    session.add(user)
     await session.commit()
-    await session.refresh(user)
+    invalidate_user_cache(user.id)
 
     APP_LOGGER.info(
-        f"[admin_users] role changed user_id={user.id} {old_role.value} -> {new_role.value}"
+        "[admin_users] role changed user_id=%s %s -> %s",
+        user.id,
+        old_role.value,
+        new_role.value,
     )
 
     return UserRead.model_validate(user)
@@ -117,24 +124,17 @@ async def update_user_block(
     """
     Блокировка/разблокировка пользователя.
     """
-    stmt = select(User).where(User.id == user_id)
-    result = await session.execute(stmt)
-    user = result.scalar_one_or_none()
-
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Пользователь не найден",
-        )
+    user = await get_or_404(session, User, user_id, "Пользователь не найден")
 
     user.is_blocked = payload.is_blocked
 
-    session.add(user)
     await session.commit()
-    await session.refresh(user)
+    invalidate_user_cache(user.id)
 
     APP_LOGGER.info(
-        f"[admin_users] block changed user_id={user.id} is_blocked={user.is_blocked}"
+        "[admin_users] block changed user_id=%s is_blocked=%s",
+        user.id,
+        user.is_blocked,
     )
 
     return UserRead.model_validate(user)
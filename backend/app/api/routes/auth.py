@@ -1,18 +1,19 @@
 from datetime import timedelta
 
-from jose import JWTError, jwt
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
+from sqlalchemy import literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.loader import APP_LOGGER
 from app.core.config import settings
 from app.core.security import (
     create_access_token,
-    hash_password,
-    verify_password,
+    ahash_password,
+    averify_password,
+    password_needs_rehash,
     create_password_reset_token,
+    decode_reset_token,
 )
 from app.db.session import get_session
 from app.models.user import User, UserRole
@@ -32,11 +33,9 @@ async def register_user(
     normalized_email = payload.email.strip().lower()
 
     # Проверяем, есть ли уже такой пользователь
-    query = select(User).where(User.email == normalized_email)
-    result = await session.execute(query)
-    existing_user = result.scalar_one_or_none()
+    exists_query = select(literal(1)).where(User.email == normalized_email).limit(1)
 
-    if existing_user:
+    if await session.scalar(exists_query):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Пользователь с таким email уже существует",
@@ -45,12 +44,11 @@ async def register_user(
     user = User(
         email=normalized_email,  # <-- сохраняем уже в нижнем регистре
         full_name=payload.full_name,
-        hashed_password=hash_password(payload.password),
+        hashed_password=await ahash_password(payload.password),
         role=UserRole.user,
     )
     session.add(user)
     await session.commit()
-    await session.refresh(user)
 
     return UserRead.model_validate(user)
 
@@ -64,10 +62,12 @@ async def login_user(
     normalized_email = form_data.username.strip().lower()
 
     query = select(User).where(User.email == normalized_email)
-    result = await session.execute(query)
-    user = result.scalar_one_or_none()
+    user = await session.scalar(query)
 
-    if user is None or not verify_password(form_data.password, user.hashed_password):
+    password_ok = user is not None and await averify_password(
+        form_data.password, user.hashed_password
+    )
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Неверный email или пароль",
@@ -79,6 +79,12 @@ async def login_user(
             detail="Аккаунт заблокирован",
         )
 
+    # Старые bcrypt/pbkdf2-хеши переводим на Argon2id при удачном входе:
+    # только сейчас у нас есть открытый пароль
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await ahash_password(form_data.password)
+        await session.commit()
+
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
         data={"sub": str(user.id), "email": user.email, "role": user.role.value},
@@ -101,8 +107,7 @@ async def forgot_password(
     normalized_email = payload.email.strip().lower()
 
     stmt = select(User).where(User.email == normalized_email)
-    res = await session.execute(stmt)
-    user = res.scalar_one_or_none()
+    user = await session.scalar(stmt)
 
     # Одинаковый ответ для найденного/ненайденного пользователя
     public_detail = (
@@ -125,23 +130,17 @@ async def forgot_password(
         "Если вы не запрашивали восстановление пароля, просто игнорируйте это письмо."
     )
 
-    try:
-        send_email(
-            to=user.email,
-            subject="Восстановление пароля на Pulse Afisha",
-            text=body,
-        )
-        APP_LOGGER.info(
-            "[forgot_password] reset email sent user_id=%s email=%s",
-            user.id,
-            user.email,
-        )
-    except Exception:
-        APP_LOGGER.exception(
-            "[forgot_password] failed to send email user_id=%s email=%s",
-            user.id,
-            user.email,
-        )
+    # Письмо уходит в очередь: SMTP может отвечать секундами, ответ его не ждёт
+    send_email(
+        to=user.email,
+        subject="Восстановление пароля на Pulse Afisha",
+        text=body,
+    )
+    APP_LOGGER.info(
+        "[forgot_password] reset email queued user_id=%s email=%s",
+        user.id,
+        user.email,
+    )
 
     return {"detail": public_detail}
 
@@ -151,31 +150,14 @@ async def reset_password(
     payload: PasswordResetApply,
     session: AsyncSession = Depends(get_session),
 ):
-    try:
-        data = jwt.decode(
-            payload.token,
-            settings.secret_key,
-            algorithms=[settings.algorithm],
-        )
-    except JWTError:
+    data = decode_reset_token(payload.token)
+    if data is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Ссылка для восстановления недействительна или устарела.",
         )
 
-    if data.get("scope") != "password_reset":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Неверный тип токена восстановления.",
-        )
-
-    user_id = data.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Некорректный токен.",
-        )
-
+    user_id = data["sub"]
     stmt = select(User).where(User.id == int(user_id))
     res = await session.execute(stmt)
     user = res.scalar_one_or_none()
@@ -186,7 +168,7 @@ async def reset_password(
             detail="Пользователь не найден.",
         )
 
-    user.hashed_password = hash_password(payload.new_password)
+    user.hashed_password = await ahash_password(payload.new_password)
     session.add(user)
     await session.commit()
 
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from collections.abc import Sequence
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps.auth import role_required
+from app.api.deps.etag import check_etag
 from app.db.session import get_session
 from app.models.event import EventCategory
 from app.models.user import UserRole
@@ -13,12 +16,21 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 
 @router.get("/", response_model=list[EventCategoryRead])
 async def list_categories(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
-) -> list[EventCategoryRead]:
-    """Список всех категорий событий."""
+) -> Sequence[EventCategory]:
+    """
+    Список всех категорий событий.
+
+    Категории только добавляются, поэтому версия списка — (max(id), count).
+    """
+    version_stmt = select(func.max(EventCategory.id), func.count())
+    await check_etag(request, response, session, version_stmt)
+
     result = await session.execute(select(EventCategory).order_by(EventCategory.name))
     categories = result.scalars().all()
-    return [EventCategoryRead.model_validate(c) for c in categories]
+    return categories
 
 
 @router.post(
@@ -32,11 +44,12 @@ async def create_category(
     session: AsyncSession = Depends(get_session),
 ) -> EventCategoryRead:
     """Создание новой категории (только админ)."""
-    exists_query = select(EventCategory).where(
-        (EventCategory.name == payload.name) | (EventCategory.slug == payload.slug)
+    exists_query = (
+        select(literal(1))
+        .where((EventCategory.name == payload.name) | (EventCategory.slug == payload.slug))
+        .limit(1)
     )
-    exists = await session.execute(exists_query)
-    if exists.scalar_one_or_none():
+    if await session.scalar(exists_query):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Категория с таким названием или slug уже существует",
@@ -49,5 +62,4 @@ async def create_category(
     )
     session.add(category)
     await session.commit()
-    await session.refresh(category)
     return EventCategoryRead.model_validate(category)
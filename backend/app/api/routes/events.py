@@ -1,24 +1,159 @@
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from contextlib import asynccontextmanager
 from datetime import datetime
-import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel
-from sqlalchemy import and_, or_, select, func
+from typing import Any
+from urllib.parse import urlencode
+
+import anyio
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import (
+    ColumnElement,
+    RowMapping,
+    and_,
+    bindparam,
+    case,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-
-from app.api.deps.auth import get_current_user, role_required
-from app.db.session import get_session
-from app.models.event import Event, EventCategory, EventStatus
-from app.models.user import User, UserRole
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from starlette.types import Receive, Scope, Send
+
+from app.api.deps.auth import AuthUser, get_current_user, role_required
+from app.api.deps.db import is_fk_violation
+from app.api.deps.event import get_owned_event
+from app.db.session import AsyncSessionLocal, get_session
+from app.models.event import (
+    EVENT_POINT,
+    EVENT_SEARCH_VECTOR,
+    SEARCH_CONFIG,
+    Event,
+    EventCategory,
+    EventStatus,
+)
+from app.models.user import UserRole
 from app.models.event_rsvp import EventRSVP, RSVPStatus
 from app.schemas.rsvp import EventRSVPMutate, EventRSVPRead, EventRSVPStats
-from app.schemas.event import EventCreate, EventRead, EventUpdate, EventModerationAction
+from app.schemas.event import (
+    EVENT_LIST_ADAPTER,
+    EventCreate,
+    EventModerationAction,
+    EventRead,
+    EventUpdate,
+)
+from app.services import event_cache, geocode
 
 router = APIRouter(
     prefix="/events",
     tags=["events"],
 )
 
+# Статус подставляется в SQL литералом: так и generic-план подготовленного
+# выражения может опереться на частичные индексы WHERE status = 'published'
+IS_PUBLISHED = Event.status == bindparam(
+    "published_status",
+    EventStatus.published,
+    type_=Event.status.type,
+    literal_execute=True,
+)
+
+# Имя FK event.category_id -> eventcategory.id по соглашению Postgres
+EVENT_CATEGORY_FK = "event_category_id_fkey"
+
+
+def _owner_conditions(user: AuthUser) -> list[ColumnElement[bool]]:
+    """
+    Условие «событие принадлежит пользователю» для WHERE.
+
+    Администратору доступны любые события — для него условий нет.
+    """
+    if user.role == UserRole.admin:
+        return []
+    return [Event.organizer_id == user.id]
+
+
+# Карточка опубликованного события собирается один раз при импорте:
+# на каждый запрос остаётся только подставить параметры
+PUBLISHED_EVENT = (
+    select(Event)
+    .options(joinedload(Event.category, innerjoin=True), raiseload("*"))
+    .where(Event.id == bindparam("event_id"), Event.status == EventStatus.published)
+)
+
+
+# Колонки ленты: поля EventRead плюс категория с префиксом category_
+FEED_COLUMNS = (
+    Event.id,
+    Event.title,
+    Event.description,
+    Event.organizer_id,
+    Event.status,
+    Event.starts_at,
+    Event.ends_at,
+    Event.address_text,
+    Event.latitude,
+    Event.longitude,
+    Event.is_free,
+    Event.price_from,
+    Event.capacity,
+    Event.created_at,
+    Event.moderation_comment,
+    EventCategory.id.label("category_id"),
+    EventCategory.name.label("category_name"),
+    EventCategory.slug.label("category_slug"),
+    EventCategory.description.label("category_description"),
+)
+
+
+def _feed_row_to_dict(row: RowMapping) -> dict[str, Any]:
+    """Собирает из плоской строки ленты вложенную структуру EventRead."""
+    data = dict(row)
+    data["category"] = {
+        "id": data.pop("category_id"),
+        "name": data.pop("category_name"),
+        "slug": data.pop("category_slug"),
+        "description": data.pop("category_description"),
+    }
+    return data
+
+
+@asynccontextmanager
+async def _category_fk_guard(session: AsyncSession) -> AsyncIterator[None]:
+    """
+    Переводит нарушение внешнего ключа категории в 400.
+
+    Категорию заранее не ищем: несуществующий category_id отвергнет
+    внешний ключ в БД. Это на запрос короче и без гонки между проверкой
+    и записью.
+    """
+    try:
+        yield
+    except IntegrityError as exc:
+        await session.rollback()
+        if is_fk_violation(exc, EVENT_CATEGORY_FK):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Указанная категория не существует",
+            ) from exc
+        raise
+
+
+def _viewport_box(
+    lng_min: float, lat_min: float, lng_max: float, lat_max: float
+) -> ColumnElement[Any]:
+    """Прямоугольник области карты: углы (долгота, широта)."""
+    return func.box(func.point(lng_min, lat_min), func.point(lng_max, lat_max))
+
 
 @router.get("/", response_model=list[EventRead])
 async def list_events(
@@ -32,61 +167,138 @@ async def list_events(
     lng_min: float | None = Query(default=None, ge=-180, le=180),
     lng_max: float | None = Query(default=None, ge=-180, le=180),
     limit: int = Query(default=20, ge=1, le=100),
-    offset: int = Query(default=0, ge=0),
-) -> list[EventRead]:
+    offset: int = Query(
+        default=0,
+        ge=0,
+        description="Устаревшее: для глубоких страниц используйте курсор",
+    ),
+    cursor_starts_at: datetime | None = None,
+    cursor_id: int | None = Query(default=None, ge=1),
+) -> Response:
     """
     Список опубликованных событий с фильтрами.
 
     Используется лентой и картой. Гости видят только опубликованные события.
+    Готовый JSON кешируется на несколько секунд по набору параметров.
+
+    Пагинация — курсором (cursor_starts_at + cursor_id): если страница полная,
+    параметры следующей отдаются в заголовке X-Next-Cursor. Курсор не
+    пропускает строки через OFFSET, поэтому глубина страницы не влияет
+    на скорость.
+
+    Область карты (lat_min..lat_max, lng_min..lng_max): lat_min > lat_max —
+    400. lng_min > lng_max означает карту через антимеридиан: область
+    делится на два прямоугольника, [lng_min, 180] и [-180, lng_max].
     """
-    conditions = [Event.status == EventStatus.published]
+    if (cursor_starts_at is None) != (cursor_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor_starts_at и cursor_id передаются вместе",
+        )
+    if cursor_id is not None and offset:
+        # OFFSET поверх курсора снова заставил бы базу перебирать строки
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="offset нельзя сочетать с курсором",
+        )
 
-    if category_id is not None:
-        conditions.append(Event.category_id == category_id)
+    if lat_min is not None and lat_max is not None and lat_min > lat_max:
+        # box() переставил бы углы и вернул всю полосу между широтами
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="lat_min не может быть больше lat_max",
+        )
 
-    if date_from is not None:
-        conditions.append(Event.starts_at >= date_from)
-    if date_to is not None:
-        conditions.append(Event.starts_at <= date_to)
+    cache_key = event_cache.make_key(
+        "list", category_id, date_from, date_to, q,
+        lat_min, lat_max, lng_min, lng_max, limit, offset,
+        cursor_starts_at, cursor_id,
+    )
+    async def render() -> tuple[bytes, dict[str, str]]:
+        conditions = [IS_PUBLISHED]
 
-    if q:
-        like = f"%{q}%"
-        conditions.append(or_(Event.title.ilike(like), Event.description.ilike(like)))
+        if cursor_starts_at is not None:
+            conditions.append(
+                tuple_(Event.starts_at, Event.id) > tuple_(cursor_starts_at, cursor_id)
+            )
 
-    if None not in (lat_min, lat_max, lng_min, lng_max):
-        conditions.append(
-            and_(
-                Event.latitude >= lat_min,  # type: ignore[arg-type]
-                Event.latitude <= lat_max,  # type: ignore[arg-type]
-                Event.longitude >= lng_min,  # type: ignore[arg-type]
-                Event.longitude <= lng_max,  # type: ignore[arg-type]
+        if category_id is not None:
+            conditions.append(Event.category_id == category_id)
+
+        if date_from is not None:
+            conditions.append(Event.starts_at >= date_from)
+        if date_to is not None:
+            conditions.append(Event.starts_at <= date_to)
+
+        if q:
+            # подстрока — по триграммным индексам на title/description,
+            # словоформы — по полнотекстовому индексу
+            # % и _ из запроса экранируем (в Postgres LIKE по умолчанию экранирует
+            # обратный слэш): иначе «%» превращается в полный перебор
+            escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            like = f"%{escaped}%"
+            conditions.append(
+                or_(
+                    Event.title.ilike(like),
+                    Event.description.ilike(like),
+                    EVENT_SEARCH_VECTOR.op("@@")(func.plainto_tsquery(SEARCH_CONFIG, q)),
+                )
             )
+
+        if None not in (lat_min, lat_max, lng_min, lng_max):
+            # точка <@ прямоугольник — по GiST-индексу ix_event_location_gist.
+            # box() сам упорядочивает углы, поэтому область через антимеридиан
+            # (lng_min > lng_max) задаём явно двумя прямоугольниками
+            if lng_min <= lng_max:
+                conditions.append(
+                    EVENT_POINT.op("<@")(_viewport_box(lng_min, lat_min, lng_max, lat_max))
+                )
+            else:
+                conditions.append(
+                    or_(
+                        EVENT_POINT.op("<@")(_viewport_box(lng_min, lat_min, 180, lat_max)),
+                        EVENT_POINT.op("<@")(_viewport_box(-180, lat_min, lng_max, lat_max)),
+                    )
+                )
+
+        # Только нужные EventRead колонки и категория через JOIN: без второго
+        # запроса за категориями и без ORM-объектов в identity map
+        stmt = (
+            select(*FEED_COLUMNS)
+            .join(EventCategory, EventCategory.id == Event.category_id)
+            .where(*conditions)
+            .order_by(Event.starts_at, Event.id)
+            .limit(limit)
+            .offset(offset)
         )
 
-    stmt = (
-        select(Event)
-        .options(selectinload(Event.category))
-        .where(and_(*conditions))
-        .order_by(Event.starts_at)
-        .limit(limit)
-        .offset(offset)
-    )
+        result = await session.execute(stmt)
+        events = [_feed_row_to_dict(row) for row in result.mappings()]
+
+        headers: dict[str, str] = {}
+        if len(events) == limit:
+            last = events[-1]
+            headers["X-Next-Cursor"] = urlencode(
+                {"cursor_starts_at": last["starts_at"].isoformat(), "cursor_id": last["id"]}
+            )
 
-    result = await session.execute(stmt)
-    events = result.scalars().unique().all()
-    return [EventRead.model_validate(e) for e in events]
+        body = EVENT_LIST_ADAPTER.dump_json(EVENT_LIST_ADAPTER.validate_python(events))
+        return body, headers
+
+    body, headers = await event_cache.get_or_fill(cache_key, render)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/my", response_model=list[EventRead])
 async def list_my_events(
-    current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user),
     status_filter: EventStatus | None = Query(default=None),
-) -> list[EventRead]:
+) -> Response:
     """
     Список событий текущего пользователя (организатора).
 
-    По умолчанию не показывает архивные события.
+    По умолчанию не показывает архивные события. Сессия своя
+    и закрывается до сериализации ответа.
     """
     conditions = [Event.organizer_id == current_user.id]
 
@@ -97,44 +309,63 @@ async def list_my_events(
 
     stmt = (
         select(Event)
-        .options(selectinload(Event.category))
-        .where(and_(*conditions))
+        .options(joinedload(Event.category, innerjoin=True), raiseload("*"))
+        .where(*conditions)
         .order_by(Event.created_at.desc())
     )
 
-    result = await session.execute(stmt)
-    events = result.scalars().unique().all()
-    return [EventRead.model_validate(e) for e in events]
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(stmt)
+        events = result.scalars().all()
+    body = EVENT_LIST_ADAPTER.dump_json(EVENT_LIST_ADAPTER.validate_python(events))
+    return Response(content=body, media_type="application/json")
+
+
+class ReverseGeocodeResponse(BaseModel):
+    address: str | None
+
+
+# Объявлен до /{event_id}, иначе путь перехватывается как id события
+@router.get("/reverse-geocode", response_model=ReverseGeocodeResponse)
+async def reverse_geocode(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+) -> ReverseGeocodeResponse:
+    """
+    Адрес по координатам (для автоподстановки при создании события).
+
+    Ответ Nominatim кешируется по округлённым координатам.
+    """
+    address = await geocode.reverse_geocode(lat, lng)
+    return ReverseGeocodeResponse(address=address)
 
 
 @router.get("/{event_id}", response_model=EventRead)
 async def get_event(
     event_id: int,
     session: AsyncSession = Depends(get_session),
-) -> EventRead:
+) -> Response:
     """
     Получение одного события по id (для публичного просмотра).
 
-    Отдаём только опубликованные события.
+    Отдаём только опубликованные события. Ответ кешируется так же, как лента.
     """
-    stmt = (
-        select(Event)
-        .options(selectinload(Event.category))
-        .where(
-            Event.id == event_id,
-            Event.status == EventStatus.published,
-        )
-    )
-    result = await session.execute(stmt)
-    event = result.scalar_one_or_none()
+    cache_key = event_cache.make_key("event", event_id)
 
-    if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Событие не найдено",
-        )
+    async def render() -> tuple[bytes, dict[str, str]]:
+        result = await session.execute(PUBLISHED_EVENT, {"event_id": event_id})
+        event = result.scalar_one_or_none()
 
-    return EventRead.model_validate(event)
+        if event is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Событие не найдено",
+            )
+
+        return EventRead.model_validate(event).model_dump_json().encode(), {}
+
+    body, headers = await event_cache.get_or_fill(cache_key, render)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post(
@@ -145,7 +376,7 @@ async def get_event(
 async def set_event_rsvp(
     event_id: int,
     payload: EventRSVPMutate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> EventRSVPRead:
     """
@@ -156,63 +387,68 @@ async def set_event_rsvp(
     - interested — интересно
     - canceled   — отмена
     """
-    stmt_event = select(Event).where(
-        Event.id == event_id,
-        Event.status == EventStatus.published,
-    )
-    res_event = await session.execute(stmt_event)
-    event = res_event.scalar_one_or_none()
-    if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Событие не найдено или не опубликовано",
-        )
-
-    # существующий отклик
-    stmt_rsvp = select(EventRSVP).where(
-        EventRSVP.user_id == current_user.id,
-        EventRSVP.event_id == event_id,
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Событие не найдено или не опубликовано",
     )
-    res_rsvp = await session.execute(stmt_rsvp)
-    rsvp = res_rsvp.scalar_one_or_none()
-
-    old_status = rsvp.status if rsvp is not None else None
     new_status = payload.status
 
-    # --- проверка вместимости только для перехода в "going" ---
-    if (
-        new_status == RSVPStatus.going
-        and old_status != RSVPStatus.going
-        and event.capacity is not None
-        and event.capacity > 0
-    ):
-        stmt_count = select(func.count()).where(
-            EventRSVP.event_id == event_id,
-            EventRSVP.status == RSVPStatus.going,
+    # --- проверка вместимости только для "going" ---
+    # Собственный отклик пользователя не считаем, поэтому повторный
+    # "going" не упирается в лимит и старый статус читать не нужно.
+    if new_status == RSVPStatus.going:
+        # вместимость и число идущих — одним запросом
+        going_others = (
+            select(func.count())
+            .where(
+                EventRSVP.event_id == Event.id,
+                EventRSVP.status == RSVPStatus.going,
+                EventRSVP.user_id != current_user.id,
+            )
+            .scalar_subquery()
+        )
+        stmt_event = select(Event.capacity, going_others.label("going")).where(
+            Event.id == event_id,
+            Event.status == EventStatus.published,
         )
-        current_going = await session.scalar(stmt_count) or 0
+        event_row = (await session.execute(stmt_event)).one_or_none()
+        if event_row is None:
+            raise not_found
 
-        if current_going >= event.capacity:
+        capacity = event_row.capacity
+        if capacity is not None and capacity > 0 and event_row.going >= capacity:
             # мест уже нет
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="На это событие уже нет свободных мест.",
             )
 
-    # --- создаём / обновляем RSVP ---
+    # --- создаём / обновляем RSVP одним запросом ---
+    # INSERT ... SELECT FROM event WHERE published: отдельная проверка
+    # существования не нужна — для неопубликованного события строк не будет
+    published_event = select(
+        literal(current_user.id),
+        Event.id,
+        literal(new_status, EventRSVP.status.type),
+    ).where(
+        Event.id == event_id,
+        Event.status == EventStatus.published,
+    )
+    stmt = pg_insert(EventRSVP).from_select(
+        ["user_id", "event_id", "status"], published_event
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_event_rsvp_user_event",
+        set_={"status": stmt.excluded.status, "updated_at": func.now()},
+    ).returning(EventRSVP)
+    result = await session.execute(
+        stmt, execution_options={"populate_existing": True}
+    )
+    rsvp = result.scalar_one_or_none()
     if rsvp is None:
-        rsvp = EventRSVP(
-            user_id=current_user.id,
-            event_id=event_id,
-            status=new_status,
-        )
-        session.add(rsvp)
-    else:
-        rsvp.status = new_status
-        session.add(rsvp)
-
+        raise not_found
     await session.commit()
-    await session.refresh(rsvp)
+    event_cache.invalidate_rsvp_stats(event_id)
 
     return EventRSVPRead.model_validate(rsvp)
 
@@ -223,7 +459,7 @@ async def set_event_rsvp(
 )
 async def get_my_event_rsvp(
     event_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> EventRSVPRead | None:
     """
@@ -252,29 +488,91 @@ async def get_event_rsvp_stats(
 ) -> EventRSVPStats:
     """
     Простая статистика откликов по событию.
+
+    Счётчики кешируются и сбрасываются при изменении RSVP в этом процессе;
+    в остальных воркерах устаревают не дольше TTL.
     """
-    stmt = (
-        select(EventRSVP.status, func.count())
-        .where(EventRSVP.event_id == event_id)
-        .group_by(EventRSVP.status)
-    )
-    res = await session.execute(stmt)
-    rows = res.all()
+    counts = event_cache.get_rsvp_stats(event_id)
+    if counts is None:
+        stmt = select(
+            func.count().filter(EventRSVP.status == RSVPStatus.going),
+            func.count().filter(EventRSVP.status == RSVPStatus.interested),
+            func.count().filter(EventRSVP.status == RSVPStatus.canceled),
+        ).where(EventRSVP.event_id == event_id)
+        res = await session.execute(stmt)
+        counts = tuple(res.one())
+        event_cache.put_rsvp_stats(event_id, counts)
+
+    going, interested, canceled = counts
+    return {"going": going, "interested": interested, "canceled": canceled}
+
+
+RSVP_LIST_COLUMNS = (
+    EventRSVP.id,
+    EventRSVP.user_id,
+    EventRSVP.event_id,
+    EventRSVP.status,
+    EventRSVP.created_at,
+    EventRSVP.updated_at,
+)
+RSVP_LIST_KEYS = tuple(column.key for column in RSVP_LIST_COLUMNS)
+
+
+async def _stream_event_rsvps(
+    first: Sequence[RowMapping],
+    rest: AsyncIterator[Sequence[RowMapping]],
+) -> AsyncIterator[bytes]:
+    """Отдаёт RSVP события JSON-массивом, порциями по yield_per строк."""
+    yield b"["
+    separator = b""
+    partition = first
+    while True:
+        chunk = b",".join(
+            orjson.dumps(
+                {key: row[key] for key in RSVP_LIST_KEYS},
+                option=orjson.OPT_UTC_Z,
+            )
+            for row in partition
+            # у события без откликов LEFT JOIN даёт одну пустую строку
+            if row["id"] is not None
+        )
+        if chunk:
+            yield separator + chunk
+            separator = b","
+        partition = await anext(rest, None)
+        if partition is None:
+            break
+    yield b"]"
 
-    counts = {
-        RSVPStatus.going: 0,
-        RSVPStatus.interested: 0,
-        RSVPStatus.canceled: 0,
-    }
 
-    for status_value, cnt in rows:
-        counts[status_value] = cnt
+class _SessionStreamingResponse(StreamingResponse):
+    """
+    Стрим с серверного курсора сессии, открытой обработчиком.
 
-    return EventRSVPStats(
-        going=counts[RSVPStatus.going],
-        interested=counts[RSVPStatus.interested],
-        canceled=counts[RSVPStatus.canceled],
-    )
+    Сессия из зависимости закрылась бы до отправки тела, поэтому сессию
+    открывает обработчик, а закрывает ответ — после отправки в любом
+    исходе: тело отдано, клиент отключился, отправка упала или отменена.
+    Генератор тела закрывается явно, не дожидаясь сборщика мусора.
+    """
+
+    def __init__(
+        self,
+        content: AsyncGenerator[bytes, None],
+        session: AsyncSession,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(content, **kwargs)
+        self._content = content
+        self._session = session
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # при отмене запроса закрытие тоже должно дойти до конца
+            with anyio.CancelScope(shield=True):
+                await self._content.aclose()
+                await self._session.close()
 
 
 @router.get(
@@ -283,44 +581,68 @@ async def get_event_rsvp_stats(
 )
 async def list_event_rsvps_for_organizer(
     event_id: int,
-    current_user: User = Depends(
+    current_user: AuthUser = Depends(
         role_required(UserRole.organizer, UserRole.admin)
     ),
-    session: AsyncSession = Depends(get_session),
-) -> list[EventRSVPRead]:
+) -> StreamingResponse:
     """
     Список всех RSVP по событию.
 
     Организатор может смотреть только по своим событиям,
-    админ — по любым.
-    """
-    stmt_event = select(Event).where(Event.id == event_id)
-    res_event = await session.execute(stmt_event)
-    event = res_event.scalar_one_or_none()
-    if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Событие не найдено",
-        )
+    админ — по любым. Список не ограничен по размеру, поэтому
+    тело ответа стримится с серверного курсора, не собираясь в памяти.
 
-    if (
-        current_user.role != UserRole.admin
-        and event.organizer_id != current_user.id
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Нет доступа к откликам на это событие",
-        )
+    Проверка доступа и выборка — один запрос: событие LEFT JOIN отклики,
+    причём отклики присоединяются только при выполненном условии владельца.
+    Первая строка говорит, есть ли событие и чьё оно.
 
+    Сессия открывается здесь, а не зависимостью: та закрылась бы до
+    отправки тела. До ответа (404/403, ошибка запроса) её закрывает
+    обработчик, после — _SessionStreamingResponse, даже если тело
+    так и не было отдано до конца.
+    """
     stmt = (
-        select(EventRSVP)
-        .where(EventRSVP.event_id == event_id)
+        select(Event.organizer_id, *RSVP_LIST_COLUMNS)
+        .select_from(Event)
+        .outerjoin(
+            EventRSVP,
+            and_(EventRSVP.event_id == Event.id, *_owner_conditions(current_user)),
+        )
+        .where(Event.id == event_id)
         .order_by(EventRSVP.created_at.desc())
+        .execution_options(yield_per=500)
     )
-    res = await session.execute(stmt)
-    rsvps = res.scalars().unique().all()
 
-    return [EventRSVPRead.model_validate(r) for r in rsvps]
+    session = AsyncSessionLocal()
+    try:
+        result = await session.stream(stmt)
+        partitions = result.mappings().partitions()
+        first = await anext(partitions, None)
+
+        if not first:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Событие не найдено",
+            )
+
+        if (
+            current_user.role != UserRole.admin
+            and first[0]["organizer_id"] != current_user.id
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Нет доступа к откликам на это событие",
+            )
+    except BaseException:
+        await session.close()
+        raise
+
+    # дальше сессией владеет ответ
+    return _SessionStreamingResponse(
+        _stream_event_rsvps(first, partitions),
+        session,
+        media_type="application/json",
+    )
 
 
 class OrganizerEventStats(BaseModel):
@@ -330,59 +652,51 @@ class OrganizerEventStats(BaseModel):
     canceled: int
 
 
+ORGANIZER_STATS_ADAPTER = TypeAdapter(list[OrganizerEventStats])
+
+
 @router.get(
     "/rsvp/my-events-stats",
     response_model=list[OrganizerEventStats],
 )
 async def get_my_events_rsvp_stats(
-    current_user: User = Depends(
+    current_user: AuthUser = Depends(
         role_required(UserRole.organizer, UserRole.admin)
     ),
     session: AsyncSession = Depends(get_session),
-) -> list[OrganizerEventStats]:
+) -> Response:
     """
     Агрегированная статистика RSVP по всем событиям организатора.
+
+    Одна строка на событие с условными агрегатами — без сборки в Python.
+    Строки проверяются и сериализуются адаптером за один вызов, без
+    модели на каждую строку и повторной проверки через response_model.
     """
     stmt = (
         select(
             EventRSVP.event_id,
-            EventRSVP.status,
-            func.count().label("cnt"),
+            func.count().filter(EventRSVP.status == RSVPStatus.going).label("going"),
+            func.count()
+            .filter(EventRSVP.status == RSVPStatus.interested)
+            .label("interested"),
+            func.count()
+            .filter(EventRSVP.status == RSVPStatus.canceled)
+            .label("canceled"),
         )
         .join(Event, Event.id == EventRSVP.event_id)
         .where(Event.organizer_id == current_user.id)
-        .group_by(EventRSVP.event_id, EventRSVP.status)
+        .group_by(EventRSVP.event_id)
     )
 
     res = await session.execute(stmt)
-    rows = res.all()
-
-    agg: dict[int, dict[RSVPStatus, int]] = {}
-    for event_id, status_value, cnt in rows:
-        per_event = agg.setdefault(event_id, {})
-        per_event[status_value] = cnt
-
-    stats: list[OrganizerEventStats] = []
-    for event_id, per_status in agg.items():
-        stats.append(
-            OrganizerEventStats(
-                event_id=event_id,
-                going=per_status.get(RSVPStatus.going, 0),
-                interested=per_status.get(RSVPStatus.interested, 0),
-                canceled=per_status.get(RSVPStatus.canceled, 0),
-            )
-        )
-
-    return stats
+    rows = res.mappings().all()
+    body = ORGANIZER_STATS_ADAPTER.dump_json(ORGANIZER_STATS_ADAPTER.validate_python(rows))
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{event_id}/manage", response_model=EventRead)
 async def get_event_for_manage(
-    event_id: int,
-    current_user: User = Depends(
-        role_required(UserRole.organizer, UserRole.admin)
-    ),
-    session: AsyncSession = Depends(get_session),
+    event: Event = Depends(get_owned_event),
 ) -> EventRead:
     """
     Получение события для управления (редактирование/отправка на модерацию).
@@ -390,34 +704,29 @@ async def get_event_for_manage(
     Доступно только организатору этого события или администратору.
     Статус события не ограничиваем.
     """
-    stmt = (
-        select(Event)
-        .options(selectinload(Event.category))
-        .where(Event.id == event_id)
-    )
-    result = await session.execute(stmt)
-    event = result.scalar_one_or_none()
-
-    if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Событие не найдено",
-        )
+    return EventRead.model_validate(event)
 
-    if current_user.role != UserRole.admin and event.organizer_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Нельзя управлять чужим событием",
-        )
 
-    return EventRead.model_validate(event)
+# Поля EventUpdate, которые просто переносятся в UPDATE, если заданы
+_EVENT_UPDATE_FIELDS = (
+    "title",
+    "description",
+    "category_id",
+    "starts_at",
+    "ends_at",
+    "address_text",
+    "latitude",
+    "longitude",
+    "price_from",
+    "capacity",
+)
 
 
 @router.put("/{event_id}", response_model=EventRead)
 async def update_event(
     event_id: int,
     payload: EventUpdate,
-    current_user: User = Depends(
+    current_user: AuthUser = Depends(
         role_required(UserRole.organizer, UserRole.admin)
     ),
     session: AsyncSession = Depends(get_session),
@@ -430,87 +739,76 @@ async def update_event(
     снова отправляется на модерацию (pending_moderation),
     ранее указанный комментарий модератора очищается.
     """
-    stmt = select(Event).where(Event.id == event_id)
-    result = await session.execute(stmt)
-    event = result.scalar_one_or_none()
+    values: dict[str, Any] = {
+        field: value
+        for field in _EVENT_UPDATE_FIELDS
+        if (value := getattr(payload, field)) is not None
+    }
+    if payload.is_free is not None:
+        values["is_free"] = payload.is_free
+        if payload.is_free and payload.price_from is None:
+            values["price_from"] = None
 
-    if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Событие не найдено",
+    conditions = [Event.id == event_id, *_owner_conditions(current_user)]
+    if current_user.role != UserRole.admin:
+        conditions.append(Event.status != EventStatus.archived)
+        # опубликованное событие организатора уходит на повторную модерацию;
+        # решаем в том же UPDATE по статусу строки, без отдельного чтения
+        was_published = Event.status == EventStatus.published
+        values["status"] = case(
+            (was_published, literal(EventStatus.pending_moderation, Event.status.type)),
+            else_=Event.status,
+        )
+        values["moderation_comment"] = case(
+            (was_published, None), else_=Event.moderation_comment
         )
 
-    if current_user.role != UserRole.admin and event.organizer_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Нельзя редактировать чужое событие",
+    # updated_at выставит onupdate колонки. Категорию для EventRead грузим
+    # явно: под asyncio ленивая загрузка упала бы с MissingGreenlet
+    stmt = (
+        update(Event)
+        .where(*conditions)
+        .values(values)
+        .returning(Event)
+        .options(selectinload(Event.category))
+    )
+    async with _category_fk_guard(session):
+        result = await session.execute(
+            stmt, execution_options={"synchronize_session": False}
         )
+    event = result.scalar_one_or_none()
 
-    if (
-        current_user.role != UserRole.admin
-        and event.status == EventStatus.archived
-    ):
+    if event is None:
+        # Ничего не обновили — выясняем причину отдельным запросом
+        row = (
+            await session.execute(
+                select(Event.organizer_id, Event.status).where(Event.id == event_id)
+            )
+        ).one_or_none()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Событие не найдено",
+            )
+        if current_user.role != UserRole.admin and row.organizer_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Нельзя редактировать чужое событие",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Архивные события нельзя редактировать",
         )
 
-    # запоминаем, было ли событие опубликовано до изменений
-    was_published = event.status == EventStatus.published
-
-    if payload.title is not None:
-        event.title = payload.title
-    if payload.description is not None:
-        event.description = payload.description
-
-    if payload.category_id is not None:
-        cat_stmt = select(EventCategory).where(EventCategory.id == payload.category_id)
-        cat_res = await session.execute(cat_stmt)
-        if cat_res.scalar_one_or_none() is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Указанная категория не существует",
-            )
-        event.category_id = payload.category_id
-
-    if payload.starts_at is not None:
-        event.starts_at = payload.starts_at
-    if payload.ends_at is not None:
-        event.ends_at = payload.ends_at
-
-    if payload.address_text is not None:
-        event.address_text = payload.address_text
-    if payload.latitude is not None:
-        event.latitude = payload.latitude
-    if payload.longitude is not None:
-        event.longitude = payload.longitude
-
-    if payload.is_free is not None:
-        event.is_free = payload.is_free
-        if payload.is_free:
-            event.price_from = None
-
-    if payload.price_from is not None:
-        event.price_from = payload.price_from
-
-    if payload.capacity is not None:
-        event.capacity = payload.capacity
-
-    # если это организатор и событие было опубликовано — отправляем на модерацию
-    if current_user.role != UserRole.admin and was_published:
-        event.status = EventStatus.pending_moderation
-        event.moderation_comment = None
-
-    session.add(event)
     await session.commit()
-    await session.refresh(event)
+    event_cache.bump_version()
     return EventRead.model_validate(event)
 
 
 @router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_event(
     event_id: int,
-    current_user: User = Depends(
+    current_user: AuthUser = Depends(
         role_required(UserRole.organizer, UserRole.admin)
     ),
     session: AsyncSession = Depends(get_session),
@@ -522,39 +820,45 @@ async def delete_event(
     По умолчанию разрешаем удалять черновики, отклонённые и архивные события.
     Администратор может удалять любое событие.
     """
-    stmt = select(Event).where(Event.id == event_id)
-    result = await session.execute(stmt)
-    event = result.scalar_one_or_none()
-
-    if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Событие не найдено",
-        )
-
-    if current_user.role != UserRole.admin and event.organizer_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Нельзя удалять чужое событие",
-        )
-
-    if (
-        current_user.role != UserRole.admin
-        and event.status not in (EventStatus.draft, EventStatus.rejected, EventStatus.archived)
-    ):
+    deletable = (EventStatus.draft, EventStatus.rejected, EventStatus.archived)
+    conditions = [Event.id == event_id, *_owner_conditions(current_user)]
+    if current_user.role != UserRole.admin:
+        conditions.append(Event.status.in_(deletable))
+
+    # Отклики и избранное удаляются каскадом на уровне БД (ON DELETE CASCADE)
+    result = await session.execute(delete(Event).where(*conditions))
+
+    if result.rowcount == 0:
+        row = (
+            await session.execute(
+                select(Event.organizer_id, Event.status).where(Event.id == event_id)
+            )
+        ).one_or_none()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Событие не найдено",
+            )
+        if row.organizer_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Нельзя удалять чужое событие",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Удалять можно только черновики, отклонённые или архивные события",
         )
 
-    await session.delete(event)
     await session.commit()
+    event_cache.bump_version()
+    # отклики ушли каскадом — старые счётчики не должны дожить до TTL
+    event_cache.invalidate_rsvp_stats(event_id)
 
 
 @router.post("/{event_id}/submit", response_model=EventRead)
 async def submit_event_for_moderation(
     event_id: int,
-    current_user: User = Depends(
+    current_user: AuthUser = Depends(
         role_required(UserRole.organizer, UserRole.admin)
     ),
     session: AsyncSession = Depends(get_session),
@@ -564,34 +868,48 @@ async def submit_event_for_moderation(
 
     Можно отправить только свои события в статусе draft или rejected.
     """
-    stmt = select(Event).where(Event.id == event_id)
-    result = await session.execute(stmt)
+    submittable = (EventStatus.draft, EventStatus.rejected)
+    stmt = (
+        update(Event)
+        .where(
+            Event.id == event_id,
+            Event.status.in_(submittable),
+            *_owner_conditions(current_user),
+        )
+        .values(status=EventStatus.pending_moderation, moderation_comment=None)
+        .returning(Event)
+        # категория нужна EventRead; не полагаемся на загрузчик маппера
+        .options(selectinload(Event.category))
+    )
+    result = await session.execute(
+        stmt, execution_options={"synchronize_session": False}
+    )
     event = result.scalar_one_or_none()
 
     if event is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Событие не найдено",
-        )
-
-    if current_user.role != UserRole.admin and event.organizer_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Нельзя отправлять на модерацию чужое событие",
-        )
-
-    if event.status not in (EventStatus.draft, EventStatus.rejected):
+        # Ничего не обновили — выясняем причину отдельным запросом
+        row = (
+            await session.execute(
+                select(Event.organizer_id, Event.status).where(Event.id == event_id)
+            )
+        ).one_or_none()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Событие не найдено",
+            )
+        if current_user.role != UserRole.admin and row.organizer_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Нельзя отправлять на модерацию чужое событие",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Отправить на модерацию можно только черновик или отклонённое событие",
         )
 
-    event.status = EventStatus.pending_moderation
-    event.moderation_comment = None
-
-    session.add(event)
     await session.commit()
-    await session.refresh(event)
+    event_cache.bump_version()
     return EventRead.model_validate(event)
 
 
@@ -602,7 +920,7 @@ async def submit_event_for_moderation(
 )
 async def create_event(
     payload: EventCreate,
-    current_user: User = Depends(
+    current_user: AuthUser = Depends(
         role_required(UserRole.organizer, UserRole.admin)
     ),
     session: AsyncSession = Depends(get_session),
@@ -612,14 +930,6 @@ async def create_event(
 
     По умолчанию создаём в статусе draft — публикация пойдёт через модерацию.
     """
-    cat_stmt = select(EventCategory).where(EventCategory.id == payload.category_id)
-    cat_res = await session.execute(cat_stmt)
-    category = cat_res.scalar_one_or_none()
-    if category is None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Указанная категория не существует",
-        )
     if payload.ends_at is not None and payload.ends_at <= payload.starts_at:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -654,45 +964,8 @@ async def create_event(
         capacity=payload.capacity,
     )
     session.add(event)
-    await session.commit()
-    await session.refresh(event)
+    async with _category_fk_guard(session):
+        await session.commit()
+    # id и значения по умолчанию уже есть после flush; догружаем только категорию
+    await session.refresh(event, attribute_names=["category"])
     return EventRead.model_validate(event)
-
-class ReverseGeocodeResponse(BaseModel):
-    address: str | None
-@router.get("/reverse-geocode", response_model=ReverseGeocodeResponse)
-async def reverse_geocode(
-    lat: float = Query(..., ge=-90, le=90),
-    lng: float = Query(..., ge=-180, le=180),
-) -> ReverseGeocodeResponse:
-    address: str | None = None
-
-    try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            resp = await client.get(
-                "https://nominatim.openstreetmap.org/reverse",
-                params={"format": "jsonv2", "lat": lat, "lon": lng},
-                headers={"User-Agent": "pulse-afisha/1.0"},
-            )
-        resp.raise_for_status()
-        data = resp.json()
-        address = data.get("display_name")
-    except Exception:
-        address = None
-
-    return ReverseGeocodeResponse(address=address)
-
-@router.get("/reverse-geocode")
-async def reverse_geocode(
-    lat: float = Query(..., ge=-90, le=90),
-    lng: float = Query(..., ge=-180, le=180),
-) -> dict[str, str]:
-    """
-    Упрощённый reverse-geocode.
-
-    Пока без внешних API: просто формируем человекопонятную строку
-    по координатам, чтобы автоподстановка адреса работала.
-    При желании сюда потом можно прикрутить Яндекс/Google/Nominatim.
-    """
-    address = f"Точка на карте ({lat:.5f}, {lng:.5f})"
-    return {"address": address}
\ No newline at end of file
@@ -1,15 +1,16 @@
+from collections.abc import Sequence
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import and_, select, delete
+from sqlalchemy import delete, exists, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 
-from app.api.deps.auth import get_current_user
-from app.db.session import get_session
+from app.api.deps.auth import AuthUser, get_current_user
+from app.db.session import AsyncSessionLocal, get_session
 from app.models.event import Event, EventStatus
 from app.models.favorite_event import FavoriteEvent
-from app.models.user import User
 from app.schemas.event import EventRead
 
 router = APIRouter(
@@ -20,17 +21,19 @@ router = APIRouter(
 
 @router.get("/", response_model=List[EventRead])
 async def list_my_favorites(
-    current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> list[EventRead]:
+    current_user: AuthUser = Depends(get_current_user),
+) -> Sequence[Event]:
     """
     Список избранных событий текущего пользователя.
     Показываем только опубликованные события.
+
+    Сессия своя и закрывается до сериализации ответа: соединение
+    возвращается в пул сразу после чтения.
     """
     stmt = (
         select(Event)
         .join(FavoriteEvent, FavoriteEvent.event_id == Event.id)
-        .options(selectinload(Event.category))
+        .options(joinedload(Event.category, innerjoin=True))
         .where(
             FavoriteEvent.user_id == current_user.id,
             Event.status == EventStatus.published,
@@ -38,27 +41,29 @@ async def list_my_favorites(
         .order_by(FavoriteEvent.created_at.desc())
     )
 
-    result = await session.execute(stmt)
-    events = result.scalars().unique().all()
-    return [EventRead.model_validate(e) for e in events]
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(stmt)
+        events = result.scalars().all()
+    # список валидируется одним проходом через response_model
+    return events
 
 
 @router.get("/{event_id}", response_model=dict)
 async def is_favorite(
     event_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> dict:
     """
     Проверка: находится ли событие в избранном у пользователя.
     """
-    stmt = select(FavoriteEvent).where(
-        FavoriteEvent.user_id == current_user.id,
-        FavoriteEvent.event_id == event_id,
+    stmt = select(
+        exists().where(
+            FavoriteEvent.user_id == current_user.id,
+            FavoriteEvent.event_id == event_id,
+        )
     )
-    result = await session.execute(stmt)
-    fav = result.scalar_one_or_none()
-    return {"is_favorite": fav is not None}
+    return {"is_favorite": bool(await session.scalar(stmt))}
 
 
 @router.post(
@@ -68,44 +73,43 @@ async def is_favorite(
 )
 async def add_favorite(
     event_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> dict:
     """
     Добавление события в избранное.
     """
-    # проверим, что событие существует и опубликовано
-    ev_stmt = select(Event).where(
+    # INSERT ... SELECT FROM event WHERE published ON CONFLICT DO NOTHING:
+    # проверка события и дубликата — внутри одного запроса
+    published_event = select(literal(current_user.id), Event.id).where(
         Event.id == event_id,
         Event.status == EventStatus.published,
     )
-    ev_res = await session.execute(ev_stmt)
-    event = ev_res.scalar_one_or_none()
-    if event is None:
+    stmt = (
+        pg_insert(FavoriteEvent)
+        .from_select(["user_id", "event_id"], published_event)
+        .on_conflict_do_nothing(constraint="uq_favorite_user_event")
+        .returning(FavoriteEvent.id)
+    )
+    inserted = await session.scalar(stmt)
+    await session.commit()
+    if inserted is not None:
+        return {"is_favorite": True}
+
+    # ничего не вставили: либо уже в избранном, либо события нет
+    published = await session.scalar(published_event)
+    if published is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Событие не найдено или не опубликовано",
         )
-
-    # проверим, не добавлено ли уже
-    check_stmt = select(FavoriteEvent).where(
-        FavoriteEvent.user_id == current_user.id,
-        FavoriteEvent.event_id == event_id,
-    )
-    check_res = await session.execute(check_stmt)
-    if check_res.scalar_one_or_none() is not None:
-        return {"is_favorite": True}
-
-    fav = FavoriteEvent(user_id=current_user.id, event_id=event_id)
-    session.add(fav)
-    await session.commit()
     return {"is_favorite": True}
 
 
 @router.delete("/{event_id}", status_code=status.HTTP_200_OK, response_model=dict)
 async def remove_favorite(
     event_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> dict:
     """
@@ -115,6 +119,8 @@ async def remove_favorite(
         FavoriteEvent.user_id == current_user.id,
         FavoriteEvent.event_id == event_id,
     )
-    await session.execute(stmt)
-    await session.commit()
+    result = await session.execute(stmt)
+    # нечего удалять — транзакцию не коммитим (откатится при закрытии сессии)
+    if result.rowcount:
+        await session.commit()
     return {"is_favorite": False}
@@ -1,14 +1,15 @@
+from collections.abc import Sequence
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import and_, desc, select
+from sqlalchemy import desc, exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps.auth import get_current_user
-from app.db.session import get_session
+from app.api.deps.auth import AuthUser, get_current_user
+from app.db.session import AsyncSessionLocal, get_session
 from app.loader import APP_LOGGER
 from app.models.organizer_request import OrganizerRequest, OrganizerRequestStatus
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 from app.schemas.organizer_request import (
     OrganizerRequestCreate,
     OrganizerRequestRead,
@@ -22,22 +23,23 @@ router = APIRouter(
 
 @router.get("/my", response_model=List[OrganizerRequestRead])
 async def list_my_organizer_requests(
-    current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> list[OrganizerRequestRead]:
+    current_user: AuthUser = Depends(get_current_user),
+) -> Sequence[OrganizerRequest]:
     """
     Список заявок текущего пользователя на роль организатора.
 
-    Отдаём в порядке от новых к старым.
+    Отдаём в порядке от новых к старым. Сессия своя и закрывается
+    до сериализации ответа.
     """
     stmt = (
         select(OrganizerRequest)
         .where(OrganizerRequest.user_id == current_user.id)
         .order_by(desc(OrganizerRequest.created_at))
     )
-    result = await session.execute(stmt)
-    rows = result.scalars().unique().all()
-    return [OrganizerRequestRead.model_validate(r) for r in rows]
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(stmt)
+        requests = result.scalars().all()
+    return requests
 
 
 @router.post(
@@ -47,7 +49,7 @@ async def list_my_organizer_requests(
 )
 async def create_organizer_request(
     payload: OrganizerRequestCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> OrganizerRequestRead:
     """
@@ -63,16 +65,14 @@ async def create_organizer_request(
             detail="У вас уже есть расширенные права, заявка не требуется",
         )
 
-    # Проверяем, нет ли активной заявки
-    stmt = select(OrganizerRequest).where(
-        and_(
+    # Проверяем, нет ли активной заявки: SELECT EXISTS, без загрузки строки
+    stmt = select(
+        exists().where(
             OrganizerRequest.user_id == current_user.id,
             OrganizerRequest.status == OrganizerRequestStatus.pending,
         )
     )
-    result = await session.execute(stmt)
-    existing = result.scalar_one_or_none()
-    if existing is not None:
+    if await session.scalar(stmt):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="У вас уже есть активная заявка, дождитесь решения",
@@ -81,14 +81,13 @@ async def create_organizer_request(
     req = OrganizerRequest(
         user_id=current_user.id,
         status=OrganizerRequestStatus.pending,
-        message=payload.message.strip(),
+        message=payload.message,
     )
     session.add(req)
     await session.commit()
-    await session.refresh(req)
 
     APP_LOGGER.info(
-        f"[OrganizerRequest] created id={req.id} user_id={current_user.id}"
+        "[OrganizerRequest] created id=%s user_id=%s", req.id, current_user.id
     )
 
     return OrganizerRequestRead.model_validate(req)
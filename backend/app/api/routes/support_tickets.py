@@ -1,21 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps.auth import get_current_user, role_required
+from app.api.deps.auth import AuthUser, get_current_user
 from app.db.session import get_session
-from app.models.user import User, UserRole
 from app.models.support_ticket import SupportTicket, SupportTicketStatus
 from app.schemas.support_ticket import (
+    TICKET_COLUMNS,
     SupportTicketCreate,
     SupportTicketRead,
+    render_tickets,
 )
+from app.services import support_cache
 
 router = APIRouter(
     prefix="/support-tickets",
     tags=["support"],
 )
 
+# Обращения пользователя, новые сверху. Собирается один раз при импорте:
+# ключ кеша скомпилированных выражений считается по готовому объекту
+MY_TICKETS = (
+    select(*TICKET_COLUMNS)
+    .where(SupportTicket.user_id == bindparam("user_id"))
+    .order_by(SupportTicket.created_at.desc())
+)
+
 
 @router.post(
     "/",
@@ -24,7 +34,7 @@ router = APIRouter(
 )
 async def create_support_ticket(
     payload: SupportTicketCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> SupportTicketRead:
     """
@@ -39,73 +49,19 @@ async def create_support_ticket(
 
     session.add(ticket)
     await session.commit()
-    await session.refresh(ticket)
+    support_cache.bump_version()
 
     return SupportTicketRead.model_validate(ticket)
 
 
 @router.get("/my", response_model=list[SupportTicketRead])
 async def list_my_support_tickets(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> list[SupportTicketRead]:
+) -> Response:
     """
     Список обращений текущего пользователя.
     """
-    stmt = (
-        select(SupportTicket)
-        .where(SupportTicket.user_id == current_user.id)
-        .order_by(SupportTicket.created_at.desc())
-    )
-    result = await session.execute(stmt)
-    tickets = result.scalars().unique().all()
-    return [SupportTicketRead.model_validate(t) for t in tickets]
-
-
-@router.get(
-    "/admin",
-    response_model=list[SupportTicketRead],
-    dependencies=[Depends(role_required(UserRole.admin))],
-)
-async def admin_list_support_tickets(
-    session: AsyncSession = Depends(get_session),
-) -> list[SupportTicketRead]:
-    """
-    Список всех обращений (для админов).
-    """
-    stmt = (
-        select(SupportTicket)
-        .order_by(
-            SupportTicket.status.asc(),
-            SupportTicket.created_at.desc(),
-        )
-    )
-    result = await session.execute(stmt)
-    tickets = result.scalars().unique().all()
-    return [SupportTicketRead.model_validate(t) for t in tickets]
-
-
-@router.delete(
-    "/admin/{ticket_id}",
-    status_code=status.HTTP_204_NO_CONTENT,
-    dependencies=[Depends(role_required(UserRole.admin))],
-)
-async def admin_delete_support_ticket(
-    ticket_id: int,
-    session: AsyncSession = Depends(get_session),
-) -> None:
-    """
-    Удаление обращения (для админки).
-    """
-    stmt = select(SupportTicket).where(SupportTicket.id == ticket_id)
-    result = await session.execute(stmt)
-    ticket = result.scalar_one_or_none()
-
-    if ticket is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Обращение не найдено",
-        )
-
-    await session.delete(ticket)
-    await session.commit()
+    result = await session.execute(MY_TICKETS, {"user_id": current_user.id})
+    body = render_tickets(result.mappings().all())
+    return Response(content=body, media_type="application/json")
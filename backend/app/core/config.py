@@ -13,11 +13,53 @@ class Settings(BaseSettings):
     db_password: str = "afisha"
     db_name: str = "afisha"
 
+    # Пул соединений с БД
+    db_pool_size: int = 20
+    db_max_overflow: int = 40
+    db_pool_recycle_seconds: int = 1800
+    # Сколько ждать свободного соединения, прежде чем отдать ошибку
+    db_pool_timeout_seconds: int = 10
+    db_query_cache_size: int = 1200
+    db_prepared_statement_cache_size: int = 256
+    # Создавать расширения и таблицы при старте. При нескольких воркерах
+    # и готовой схеме лучше выключить: каждый воркер берёт блокировки каталога
+    create_tables_on_startup: bool = True
+
+    # Подключение через PgBouncer в transaction-режиме (обычно порт 6432):
+    # пулом управляет PgBouncer, а подготовленные выражения между
+    # транзакциями не переживают — их кеши в этом режиме выключаются
+    db_pgbouncer: bool = False
+
     backend_cors_origins: list[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
     secret_key: str = "CHANGE_ME_IN_PROD"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    # Параметры Argon2id для хешей паролей (19 МиБ, 2 прохода, 2 потока)
+    argon2_time_cost: int = 2
+    argon2_memory_cost_kib: int = 19_456
+    argon2_parallelism: int = 2
+    # Сколько паролей хешируется одновременно (отдельно от общего пула потоков)
+    password_hash_concurrency: int = 8
+    thread_pool_size: int = 64
+
+    # Кеш пользователя по access-токену в get_current_user
+    auth_cache_ttl_seconds: int = 30
+    auth_cache_maxsize: int = 10_000
+
+    # Кеш публичной ленты и карточки события; другие воркеры увидят
+    # изменения не позже чем через TTL
+    events_cache_ttl_seconds: int = 10
+    events_cache_maxsize: int = 1024
+    rsvp_stats_cache_ttl_seconds: int = 60
+
+    # Кеш списка обращений в админке; другие воркеры увидят
+    # новые обращения не позже чем через TTL
+    support_admin_cache_ttl_seconds: int = 30
+
+    # Кеш обратного геокодирования (Nominatim)
+    geocode_cache_ttl_seconds: int = 86_400
+    geocode_cache_maxsize: int = 10_000
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -1,22 +1,116 @@
+import base64
+import hashlib
+import hmac
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import anyio
+import bcrypt
+import jwt
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+_ARGON2_PREFIX = "$argon2"
+_PBKDF2_PREFIX = "$pbkdf2-sha256$"
+
+# Ключ подписи JWT в байтах — один раз, а не на каждый encode/decode
+_SECRET_KEY = settings.secret_key.encode("utf-8")
+
+_argon2 = PasswordHasher(
+    time_cost=settings.argon2_time_cost,
+    memory_cost=settings.argon2_memory_cost_kib,
+    parallelism=settings.argon2_parallelism,
+    type=Type.ID,
+)
+
+
+# Хеш занимает поток и ~19 МиБ памяти: отдельный лимит не даёт всплеску
+# логинов занять весь пул потоков, нужный остальным запросам
+_hash_limiter = anyio.CapacityLimiter(settings.password_hash_concurrency)
 
 
 def hash_password(password: str) -> str:
-    """Возвращает хеш пароля."""
-    return pwd_context.hash(password)
+    """Возвращает Argon2id-хеш пароля."""
+    return _argon2.hash(password)
+
+
+def _verify_legacy_pbkdf2(plain_password: str, hashed_password: str) -> bool:
+    """
+    Проверка старых хешей passlib pbkdf2_sha256.
+
+    Формат: $pbkdf2-sha256$<rounds>$<salt>$<checksum>, salt и checksum
+    в "adapted base64" passlib ('.' вместо '+', без паддинга).
+    """
+    try:
+        rounds, salt, checksum = hashed_password[len(_PBKDF2_PREFIX):].split("$")
+        salt_bytes = _ab64_decode(salt)
+        expected = _ab64_decode(checksum)
+        actual = hashlib.pbkdf2_hmac(
+            "sha256",
+            plain_password.encode("utf-8"),
+            salt_bytes,
+            int(rounds),
+            dklen=len(expected),
+        )
+    except ValueError:
+        return False
+    return hmac.compare_digest(actual, expected)
+
+
+def _ab64_decode(data: str) -> bytes:
+    data = data.replace(".", "+")
+    return base64.b64decode(data + "=" * (-len(data) % 4))
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Проверяет совпадение пароля и его хеша."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """
+    Проверяет совпадение пароля и его хеша.
+
+    Кроме Argon2id понимает старые bcrypt- и pbkdf2_sha256-хеши.
+    """
+    if hashed_password.startswith(_ARGON2_PREFIX):
+        try:
+            return _argon2.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    if hashed_password.startswith(_PBKDF2_PREFIX):
+        return _verify_legacy_pbkdf2(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8"),
+            hashed_password.encode("ascii"),
+        )
+    except ValueError:
+        return False
+
+
+async def ahash_password(password: str) -> str:
+    """hash_password в отдельном потоке, не блокируя цикл событий."""
+    return await anyio.to_thread.run_sync(
+        hash_password, password, limiter=_hash_limiter
+    )
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password в отдельном потоке, не блокируя цикл событий."""
+    return await anyio.to_thread.run_sync(
+        verify_password, plain_password, hashed_password, limiter=_hash_limiter
+    )
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Нужно ли перехешировать пароль: старый алгоритм (bcrypt, pbkdf2)
+    или Argon2id с параметрами слабее текущих настроек.
+    """
+    if not hashed_password.startswith(_ARGON2_PREFIX):
+        return True
+    try:
+        return _argon2.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
 
 
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
@@ -26,29 +120,55 @@ def create_access_token(data: dict[str, Any], expires_delta: timedelta | None =
         expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
     )
     to_encode["exp"] = expire
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=settings.algorithm)
     return encoded_jwt
 
 
 def decode_token(token: str) -> dict[str, Any] | None:
     """Пытается декодировать токен, при ошибке возвращает None."""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        payload = jwt.decode(
+            token,
+            _SECRET_KEY,
+            algorithms=[settings.algorithm],
+            options={"require": ["exp", "sub"]},
+        )
         return payload
-    except JWTError:
+    except jwt.PyJWTError:
         return None
 
+PASSWORD_RESET_AUDIENCE = "password_reset"
+
+
 def create_password_reset_token(user_id: int, expires_minutes: int = 30) -> str:
     now = datetime.now(timezone.utc)
     exp = now + timedelta(minutes=expires_minutes)
     payload: Dict[str, Any] = {
         "sub": str(user_id),
-        "scope": "password_reset",
+        "aud": PASSWORD_RESET_AUDIENCE,
         "iat": int(now.timestamp()),
         "exp": int(exp.timestamp()),
     }
     return jwt.encode(
         payload,
-        settings.secret_key,        # у тебя уже должна быть эта настройка
+        _SECRET_KEY,
         algorithm=settings.algorithm,
-    )
\ No newline at end of file
+    )
+
+
+def decode_reset_token(token: str) -> dict[str, Any] | None:
+    """
+    Декодирует токен восстановления пароля.
+
+    Подпись, срок действия и audience проверяет PyJWT; при любой ошибке — None.
+    """
+    try:
+        return jwt.decode(
+            token,
+            _SECRET_KEY,
+            algorithms=[settings.algorithm],
+            audience=PASSWORD_RESET_AUDIENCE,
+            options={"require": ["exp", "sub", "aud"]},
+        )
+    except jwt.PyJWTError:
+        return None
@@ -2,7 +2,16 @@ from sqlalchemy.orm import DeclarativeBase, declared_attr
 
 
 class Base(DeclarativeBase):
-    """Базовый класс для всех моделей."""
+    """
+    Базовый класс для всех моделей.
+
+    Метки времени created_at/updated_at считает БД (now()): default пишет
+    now() прямо в INSERT, поэтому работает и на таблицах, созданных до
+    server_default. eager_defaults забирает посчитанные значения через
+    RETURNING того же INSERT/UPDATE — без ленивой дозагрузки после flush.
+    """
+
+    __mapper_args__ = {"eager_defaults": True}
 
     @declared_attr.directive
     def __tablename__(cls) -> str:  # type: ignore[override]
@@ -0,0 +1,30 @@
+# app/db/migrations.py
+"""
+Миграции данных, которые выполняются при каждом старте приложения.
+
+Alembic в проекте нет, поэтому каждый шаг обязан быть идемпотентным:
+повторный запуск (в том числе несколькими воркерами сразу) ничего
+не меняет в уже переведённых строках.
+"""
+from sqlalchemy import text
+
+from app.db.session import engine
+
+MIGRATIONS = (
+    # preferences: свободный текст -> JSON-объект {"note": текст},
+    # чтобы GIN-индекс по @> / ? видел документы, а не строки
+    text(
+        """
+        UPDATE "user"
+        SET preferences = jsonb_build_object('note', preferences #>> '{}')
+        WHERE jsonb_typeof(preferences) = 'string'
+        """
+    ),
+)
+
+
+async def run_migrations() -> None:
+    """Применяет все шаги в одной транзакции."""
+    async with engine.begin() as conn:
+        for step in MIGRATIONS:
+            await conn.execute(step)
@@ -1,13 +1,43 @@
 from collections.abc import AsyncGenerator
+from typing import Any
+from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
+engine_options: dict[str, Any]
+if settings.db_pgbouncer:
+    # Соединения держит PgBouncer; серверное соединение меняется между
+    # транзакциями, поэтому без кешей выражений и с уникальными именами
+    engine_options = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+else:
+    engine_options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        # кеш подготовленных выражений на соединение (по умолчанию у диалекта 100)
+        "connect_args": {
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        },
+    }
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,
     future=True,
+    query_cache_size=settings.db_query_cache_size,
+    **engine_options,
 )
 
 AsyncSessionLocal = async_sessionmaker(
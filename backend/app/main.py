@@ -1,10 +1,26 @@
-from fastapi import FastAPI
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import anyio
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
 
 from app.api.router import api_router
 from app.core.config import settings
 from app.db.base import Base
+from app.db.migrations import run_migrations
 from app.db.session import engine
+from app.loader import APP_LOGGER
+from app.schemas.event import EventCategoryRead, EventRead
+from app.schemas.organizer_request import OrganizerRequestRead
+from app.schemas.rsvp import EventRSVPRead, MyRSVPItem
+from app.schemas.support_ticket import SupportTicketRead
+from app.schemas.user import UserRead
+from app.services import email, geocode
 from app.api.routes import admin_users
 from app.api.routes import organizer_requests, admin_organizer_requests
 from app.api.routes import (
@@ -18,9 +34,83 @@ from app.api.routes import rsvp
 import app.models  # noqa: F401
 
 
+# Схемы ответов объявлены с defer_build: pydantic-core схема строится
+# не при импорте, а здесь, один раз при старте — до первого запроса
+_RESPONSE_SCHEMAS = (
+    EventCategoryRead,
+    EventRead,
+    EventRSVPRead,
+    MyRSVPItem,
+    OrganizerRequestRead,
+    SupportTicketRead,
+    UserRead,
+)
+
+
+async def _create_tables() -> None:
+    """Создаёт расширения и недостающие таблицы (для учебного проекта)."""
+    async with engine.begin() as conn:
+        # нужно для триграммных индексов поиска событий
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def _warm_up_pool() -> None:
+    """
+    Заранее открывает pool_size соединений с БД.
+
+    Иначе первые запросы после старта платят за TCP-подключение
+    и авторизацию в Postgres.
+    """
+    async def checkout() -> AsyncConnection:
+        conn = await engine.connect()
+        await conn.exec_driver_sql("SELECT 1")
+        return conn
+
+    conns = await asyncio.gather(
+        *(checkout() for _ in range(settings.db_pool_size)),
+        return_exceptions=True,
+    )
+    for conn in conns:
+        if isinstance(conn, AsyncConnection):
+            # соединение возвращается в пул, а не закрывается
+            await conn.close()
+        else:
+            # старт не валим (пул догреется на запросах), но и не молчим:
+            # недоступная БД или неверный пароль должны быть видны в логах
+            APP_LOGGER.warning("[startup] DB pool warm-up checkout failed", exc_info=conn)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Подготовка ресурсов при старте и их освобождение при остановке."""
+    # общий пул потоков (синхронные задачи); хеширование
+    # паролей идёт в нём же, но под своим лимитом из app.core.security
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.thread_pool_size
+
+    for schema in _RESPONSE_SCHEMAS:
+        schema.model_rebuild()
+
+    if settings.create_tables_on_startup:
+        await _create_tables()
+    await run_migrations()
+    # за PgBouncer пула на стороне приложения нет — греть нечего
+    if not settings.db_pgbouncer:
+        await _warm_up_pool()
+    email.start()
+
+    yield
+
+    await geocode.aclose()
+    await email.aclose()
+    await engine.dispose()
+
+
 app = FastAPI(
     title=settings.project_name,
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 origins = [
     "http://localhost:3000",   # для локальной разработки
@@ -32,20 +122,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # курсор следующей страницы ленты
+    expose_headers=["X-Next-Cursor"],
 )
 
 
-@app.on_event("startup")
-async def on_startup() -> None:
-    """Создаёт таблицы при старте (для учебного проекта)."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+# Тело ответа /health постоянно — сериализуем его один раз
+_HEALTH_BODY = b'{"status":"ok"}'
 
 
-@app.get("/health")
-async def health_check() -> dict[str, str]:
+@app.get("/health", response_model=dict[str, str])
+async def health_check() -> Response:
     """Проверка доступности сервиса."""
-    return {"status": "ok"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 app.include_router(api_router, prefix=settings.api_v1_prefix)
@@ -7,9 +7,13 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    func,
+    literal_column,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -42,6 +46,23 @@ class EventCategory(Base):
 class Event(Base):
     """Событие, отображаемое в ленте и на карте."""
 
+    __table_args__ = (
+        # Публичная лента: status = 'published' ORDER BY starts_at, id —
+        # один проход по частичному индексу без сортировки
+        Index(
+            "ix_event_published_starts_at",
+            "starts_at",
+            "id",
+            postgresql_where=text("status = 'published'"),
+        ),
+        # «Мои события»: organizer_id = ? ORDER BY created_at DESC
+        Index(
+            "ix_event_organizer_created_at",
+            "organizer_id",
+            text("created_at DESC"),
+        ),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -57,7 +78,9 @@ class Event(Base):
         ForeignKey("user.id", ondelete="CASCADE"),
         nullable=False,
     )
-    organizer: Mapped[User] = relationship(lazy="selectin",)
+    # Наружу отдаём только organizer_id; случайная ленивая загрузка
+    # пользователя (с хешем пароля) должна падать, а не тихо идти в БД
+    organizer: Mapped[User] = relationship(lazy="raise")
 
     status: Mapped[EventStatus] = mapped_column(
         Enum(EventStatus, name="event_status_enum"),
@@ -84,12 +107,65 @@ class Event(Base):
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        default=func.now(),
+        server_default=func.now(),
         nullable=False,
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False,
     )
+
+
+# Конфигурация и документ полнотекстового поиска собраны из литералов,
+# а не bind-параметров: выражение в запросе должно совпадать с выражением индекса.
+SEARCH_CONFIG = literal_column("'russian'::regconfig")
+
+EVENT_SEARCH_VECTOR = func.to_tsvector(
+    SEARCH_CONFIG,
+    func.coalesce(Event.title, literal_column("''"))
+    .op("||")(literal_column("' '"))
+    .op("||")(func.coalesce(Event.description, literal_column("''"))),
+)
+
+Event.__table__.append_constraint(
+    Index("ix_event_search_fts", EVENT_SEARCH_VECTOR, postgresql_using="gin")
+)
+
+# Триграммные индексы (pg_trgm) под поиск подстроки: col ILIKE '%q%'.
+# Индексируем сами колонки, а регистр оставляем ILIKE: gin_trgm_ops
+# поддерживает его напрямую, и запросу не нужно повторять lower() из индекса.
+Event.__table__.append_constraint(
+    Index(
+        "ix_event_title_trgm",
+        Event.title,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+)
+Event.__table__.append_constraint(
+    Index(
+        "ix_event_description_trgm",
+        Event.description,
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+    )
+)
+
+# Точка события во встроенном геометрическом типе Postgres (x — долгота,
+# y — широта). GiST по выражению отвечает на запрос «точка внутри
+# прямоугольника карты» одним обходом R-дерева без PostGIS.
+EVENT_POINT = func.point(Event.longitude, Event.latitude)
+
+Event.__table__.append_constraint(
+    Index(
+        "ix_event_location_gist",
+        EVENT_POINT,
+        postgresql_using="gist",
+        # карта показывает только опубликованные события
+        postgresql_where=Event.status == EventStatus.published,
+    )
+)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Integer, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -24,7 +24,8 @@ class FavoriteEvent(Base):
   )
   created_at: Mapped[datetime] = mapped_column(
       DateTime(timezone=True),
-      default=datetime.utcnow,
+      default=func.now(),
+      server_default=func.now(),
       nullable=False,
   )
 
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -18,6 +18,20 @@ class SupportTicket(Base):
     """Обращение/жалоба пользователя в поддержку."""
 
     __tablename__ = "support_ticket"
+    __table_args__ = (
+        # «Мои обращения»: user_id = ? ORDER BY created_at DESC
+        Index(
+            "ix_support_ticket_user_created_at",
+            "user_id",
+            text("created_at DESC"),
+        ),
+        # Админка: ORDER BY status, created_at DESC — в порядке индекса, без сортировки
+        Index(
+            "ix_support_ticket_status_created_at",
+            "status",
+            text("created_at DESC"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
@@ -25,7 +39,6 @@ class SupportTicket(Base):
       Integer,
       ForeignKey("user.id", ondelete="CASCADE"),
       nullable=False,
-      index=True,
     )
     user: Mapped[User] = relationship()
 
@@ -36,19 +49,20 @@ class SupportTicket(Base):
         Enum(SupportTicketStatus, name="support_ticket_status_enum"),
         nullable=False,
         default=SupportTicketStatus.open,
-        index=True,
     )
 
     admin_reply: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        default=func.now(),
+        server_default=func.now(),
         nullable=False,
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False,
     )
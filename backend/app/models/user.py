@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 from typing import Any
-from sqlalchemy import Boolean, DateTime, Enum, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Enum, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import JSONB
 from app.db.base import Base
@@ -16,6 +16,11 @@ class UserRole(str, enum.Enum):
 class User(Base):
     """Пользователь системы афиши."""
 
+    __table_args__ = (
+        # Фильтры по предпочтениям: preferences @> '{...}' и preferences ? 'key'
+        Index("ix_user_preferences_gin", "preferences", postgresql_using="gin"),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     email: Mapped[str] = mapped_column(
         String(255), unique=True, index=True, nullable=False
@@ -29,8 +34,6 @@ class User(Base):
     phone: Mapped[str | None] = mapped_column(String(50), nullable=True)
     telegram: Mapped[str | None] = mapped_column(String(64), nullable=True)
     about: Mapped[str | None] = mapped_column(Text, nullable=True)
-    preferences: Mapped[str | None] = mapped_column(Text, nullable=True)
-
     preferences: Mapped[dict[str, Any] | None] = mapped_column(
         JSONB,
         nullable=True,
@@ -45,12 +48,14 @@ class User(Base):
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        default=func.now(),
+        server_default=func.now(),
         nullable=False,
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False,
     )
\ No newline at end of file
@@ -7,7 +7,8 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: str | None = None
-    email: EmailStr | None = None
+    # токен подписан нами, email в нём взят из БД
+    email: str | None = None
     role: str | None = None
 
 class ForgotPasswordRequest(BaseModel):
@@ -0,0 +1,7 @@
+from typing import Annotated
+
+from pydantic import StringConstraints
+
+# Строка без пробелов по краям; min_length/max_length из Field
+# проверяются уже после обрезки
+StrippedStr = Annotated[str, StringConstraints(strip_whitespace=True)]
@@ -1,8 +1,9 @@
 from datetime import datetime, timezone
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 
 from app.models.event import EventStatus
+from app.schemas.common import StrippedStr
 
 
 class EventCategoryRead(BaseModel):
@@ -11,8 +12,7 @@ class EventCategoryRead(BaseModel):
     slug: str
     description: str | None = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class EventCategoryCreate(BaseModel):
@@ -22,7 +22,7 @@ class EventCategoryCreate(BaseModel):
 
 
 class EventModerationAction(BaseModel):
-    moderation_comment: str | None = Field(
+    moderation_comment: StrippedStr | None = Field(
         default=None,
         max_length=2000,
         description="Комментарий модератора (причина решения)",
@@ -143,5 +143,9 @@ class EventRead(BaseModel):
     # 🔹 вот это добавили — комментарий модератора попадёт во все ответы EventRead
     moderation_comment: str | None = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+
+# Адаптер списка строится один раз при импорте и переиспользуется
+# всеми эндпоинтами, которые отдают списки событий
+EVENT_LIST_ADAPTER = TypeAdapter(list[EventRead])
@@ -1,12 +1,13 @@
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.organizer_request import OrganizerRequestStatus
+from app.schemas.common import StrippedStr
 
 
 class OrganizerRequestCreate(BaseModel):
-    message: str = Field(
+    message: StrippedStr = Field(
         ...,
         min_length=10,
         max_length=2000,
@@ -23,5 +24,4 @@ class OrganizerRequestRead(BaseModel):
     created_at: datetime
     resolved_at: datetime | None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
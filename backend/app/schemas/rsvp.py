@@ -1,6 +1,8 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+# pydantic на Python < 3.12 принимает только TypedDict из typing_extensions
+from typing_extensions import TypedDict
 
 from app.models.event_rsvp import RSVPStatus
 from app.schemas.event import EventRead  # ← ДОБАВИТЬ этот импорт
@@ -18,11 +20,12 @@ class EventRSVPRead(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
-class EventRSVPStats(BaseModel):
+class EventRSVPStats(TypedDict):
+    """Счётчики откликов события: считаются в БД, проверять нечего."""
+
     going: int
     interested: int
     canceled: int
@@ -42,5 +45,4 @@ class MyRSVPItem(BaseModel):
     updated_at: datetime
     event: EventRead
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
@@ -1,13 +1,22 @@
+from collections.abc import Sequence
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from sqlalchemy import RowMapping
 
-from app.models.support_ticket import SupportTicketStatus
+from app.models.support_ticket import SupportTicket, SupportTicketStatus
+from app.schemas.common import StrippedStr
 
 
 class SupportTicketCreate(BaseModel):
-    subject: str = Field(..., min_length=3, max_length=255)
-    message: str = Field(..., min_length=10, max_length=5000)
+    subject: StrippedStr = Field(..., min_length=3, max_length=255)
+    message: StrippedStr = Field(..., min_length=10, max_length=5000)
+
+
+class SupportTicketImport(SupportTicketCreate):
+    """Обращение от имени пользователя — для массовой загрузки админом."""
+
+    user_id: int = Field(..., ge=1)
 
 
 class SupportTicketRead(BaseModel):
@@ -20,9 +29,29 @@ class SupportTicketRead(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class SupportTicketReply(BaseModel):
-    reply: str = Field(..., min_length=3, max_length=5000)
+    reply: StrippedStr = Field(..., min_length=3, max_length=5000)
+
+
+TICKET_LIST_ADAPTER = TypeAdapter(list[SupportTicketRead])
+
+# Колонки SupportTicketRead: списки обращений (пользовательский и админский)
+# читаются строками, без ORM-объектов
+TICKET_COLUMNS = (
+    SupportTicket.id,
+    SupportTicket.user_id,
+    SupportTicket.subject,
+    SupportTicket.message,
+    SupportTicket.status,
+    SupportTicket.admin_reply,
+    SupportTicket.created_at,
+    SupportTicket.updated_at,
+)
+
+
+def render_tickets(rows: Sequence[RowMapping]) -> bytes:
+    """JSON списка обращений: одна проверка всего списка и сериализация."""
+    return TICKET_LIST_ADAPTER.dump_json(TICKET_LIST_ADAPTER.validate_python(rows))
@@ -1,12 +1,23 @@
 from datetime import datetime
+from typing import Any
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter, field_validator
 
 from app.models.user import UserRole
 
 
+def _wrap_legacy_preferences(value: Any) -> Any:
+    """
+    Раньше preferences были свободным текстом. Старую строку
+    (в БД или в теле запроса) превращаем в объект {"note": строка}.
+    """
+    if isinstance(value, str):
+        return {"note": value}
+    return value
+
+
 class UserBase(BaseModel):
-    email: EmailStr
+    email: str
     full_name: str | None = None
     avatar_url: str | None = None
     role: UserRole
@@ -26,7 +37,8 @@ class UserLogin(BaseModel):
 
 class UserRead(BaseModel):
     id: int
-    email: EmailStr
+    # email из нашей БД уже проверен при регистрации — повторно не валидируем
+    email: str
     full_name: str | None
     avatar_url: str | None
     role: UserRole
@@ -35,10 +47,14 @@ class UserRead(BaseModel):
     phone: str | None = None
     telegram: str | None = None
     about: str | None = None
-    preferences: str | None = None
+    preferences: dict[str, Any] | None = None
+
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
-    class Config:
-        from_attributes = True
+    # строки, ещё не переведённые миграцией, читаются без ошибки
+    _legacy_preferences = field_validator("preferences", mode="before")(
+        _wrap_legacy_preferences
+    )
 
 
 class UserUpdateProfile(BaseModel):
@@ -47,12 +63,22 @@ class UserUpdateProfile(BaseModel):
     phone: str | None = Field(default=None, max_length=50)
     telegram: str | None = Field(default=None, max_length=64)
     about: str | None = Field(default=None, max_length=2000)
-    preferences: str | None = Field(
+    preferences: dict[str, Any] | None = Field(
         default=None,
-        max_length=2000,
-        description="Предпочтения по мероприятиям, свободный текст.",
+        max_length=50,
+        description=(
+            "Предпочтения по мероприятиям: JSON-объект, например "
+            '{"categories": ["concerts"], "city": "Минск"}. '
+            "Ищется индексом по preferences @> / ?. Строка (старый формат) "
+            'принимается и сохраняется как {"note": строка}.'
+        ),
     )
 
+    _legacy_preferences = field_validator("preferences", mode="before")(
+        _wrap_legacy_preferences
+    )
+
+
 class UserRoleUpdate(BaseModel):
     role: UserRole = Field(
         ...,
@@ -64,4 +90,7 @@ class UserBlockUpdate(BaseModel):
     is_blocked: bool = Field(
         ...,
         description="Заблокировать (true) или разблокировать (false) пользователя",
-    )
\ No newline at end of file
+    )
+
+
+USER_LIST_ADAPTER = TypeAdapter(list[UserRead])
@@ -1,43 +1,234 @@
 # app/services/email.py
+"""
+Отправка писем через SMTP (Gmail).
+
+send_email только кладёт письмо в очередь и сразу возвращается, обработчик
+запроса не ждёт SMTP. Фоновые воркеры (запускаются в lifespan) забирают
+из очереди сразу пачку писем и отправляют её через одно соединение,
+поэтому всплеск уведомлений платит за TCP, STARTTLS и AUTH один раз.
+
+Открытые соединения переживают пачку: перед повторным использованием
+соединение проверяется NOOP, после письма сбрасывается RSET; после
+_MAX_MESSAGES_PER_CONNECTION писем соединение переоткрывается.
+
+Временные сбои (обрыв, таймаут, ответ 4xx) повторяются с экспоненциальной
+паузой через новое соединение; каждая операция ограничена таймаутом.
+"""
+import asyncio
 import os
-import smtplib
+import ssl
+from dataclasses import dataclass
 from email.message import EmailMessage
 from typing import Optional
 
+import aiosmtplib
+
+from app.loader import APP_LOGGER
+
+
+@dataclass(frozen=True, slots=True)
+class SmtpConfig:
+    host: str | None
+    port: int
+    user: str | None
+    password: str | None
+    sender: str | None
+
+
+# окружение читаем один раз при импорте
+_smtp_user = os.getenv("SMTP_USER")
+SMTP = SmtpConfig(
+    host=os.getenv("SMTP_HOST", "smtp.gmail.com"),
+    port=int(os.getenv("SMTP_PORT", "587")),
+    user=_smtp_user,
+    password=os.getenv("SMTP_PASSWORD"),
+    sender=os.getenv("SMTP_FROM", _smtp_user),
+)
+_CONFIGURED = all((SMTP.host, SMTP.port, SMTP.user, SMTP.password))
+
+# TLS-контекст для STARTTLS один на процесс: без него aiosmtplib на каждом
+# подключении заново создаёт контекст и перечитывает системные сертификаты
+_TLS_CONTEXT = ssl.create_default_context()
+_TLS_CONTEXT.minimum_version = ssl.TLSVersion.TLSv1_2
+
+# воркеров немного: у каждого не больше одного открытого соединения,
+# а почтовые серверы ограничивают число параллельных сессий
+_WORKERS = 2
+_MAX_BATCH = 32
+_MAX_MESSAGES_PER_CONNECTION = 100
+_TIMEOUT_SECONDS = 30
+# попыток на письмо; паузы между ними 0.5 с, 1 с, ...
+_MAX_ATTEMPTS = 3
+_BACKOFF_SECONDS = 0.5
+# сколько при остановке ждём, пока воркеры дошлют очередь
+_DRAIN_TIMEOUT_SECONDS = 10
+
+
+@dataclass(slots=True)
+class _Connection:
+    client: aiosmtplib.SMTP
+    sent: int = 0
 
-SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
-SMTP_USER = os.getenv("SMTP_USER")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-SMTP_FROM = os.getenv("SMTP_FROM", SMTP_USER)
 
+_queue: asyncio.Queue[EmailMessage] = asyncio.Queue()
+_workers: list[asyncio.Task[None]] = []
+# свободные открытые соединения (не больше _WORKERS)
+_idle: list[_Connection] = []
+
+
+async def _close(conn: _Connection) -> None:
+    try:
+        await conn.client.quit()
+    except (aiosmtplib.SMTPException, OSError):
+        conn.client.close()
+
+
+async def _acquire() -> _Connection:
+    """Живое соединение из пула или новое (connect + STARTTLS + AUTH)."""
+    while _idle:
+        conn = _idle.pop()
+        if conn.client.is_connected and conn.sent < _MAX_MESSAGES_PER_CONNECTION:
+            try:
+                await conn.client.noop()
+                return conn
+            except (aiosmtplib.SMTPException, OSError):
+                pass
+        await _close(conn)
+
+    client = aiosmtplib.SMTP(
+        hostname=SMTP.host,
+        port=SMTP.port,
+        start_tls=True,
+        tls_context=_TLS_CONTEXT,
+        timeout=_TIMEOUT_SECONDS,
+    )
+    await client.connect()
+    await client.login(SMTP.user, SMTP.password)
+    return _Connection(client)
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Сбой, который имеет смысл повторить: сеть, таймаут или ответ 4xx."""
+    # ошибки соединения и таймауты aiosmtplib — подклассы OSError
+    if isinstance(exc, OSError):
+        return True
+    return isinstance(exc, aiosmtplib.SMTPResponseException) and 400 <= exc.code < 500
+
+
+async def _send_batch(batch: list[EmailMessage]) -> None:
+    """
+    Отправляет пачку писем через одно соединение.
+
+    Ошибка на письме закрывает соединение; повтор и следующие письма
+    пачки идут через новое. Повторяется только сама отправка: после
+    принятого письма сбой RSET закрывает соединение без повтора.
+    Не отправленные письма только логируются.
+    """
+    conn: _Connection | None = None
+    for msg in batch:
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                if conn is None:
+                    conn = await _acquire()
+                await conn.client.send_message(msg)
+            except Exception as exc:
+                if conn is not None:
+                    await _close(conn)
+                    conn = None
+                if attempt + 1 == _MAX_ATTEMPTS or not _is_transient(exc):
+                    APP_LOGGER.exception(
+                        "[send_email] failed to send to=%s", msg["To"]
+                    )
+                    break
+                await asyncio.sleep(_BACKOFF_SECONDS * 2**attempt)
+                continue
 
-def send_email(
+            conn.sent += 1
+            APP_LOGGER.info("[send_email] sent to=%s", msg["To"])
+            # письмо уже принято сервером: сбой RSET только отбрасывает
+            # соединение, повторной отправки быть не должно
+            try:
+                await conn.client.rset()
+            except Exception:
+                await _close(conn)
+                conn = None
+            break
+    if conn is not None:
+        _idle.append(conn)
+
+
+async def _email_worker() -> None:
+    while True:
+        # ждём первое письмо, остальные забираем без ожидания
+        batch = [await _queue.get()]
+        while len(batch) < _MAX_BATCH and not _queue.empty():
+            batch.append(_queue.get_nowait())
+        try:
+            await _send_batch(batch)
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def _noop_send_email(
     to: str,
     subject: str,
     text: str,
     *,
     reply_to: Optional[str] = None,
 ) -> None:
-    """
-    Простейшая синхронная отправка письма через SMTP (Gmail).
+    # Ничего не отправляем, если не настроено – чтобы не падало.
+    APP_LOGGER.debug("[send_email] SMTP not configured, email to=%s dropped", to)
 
-    В проде можно вынести в фоновые задачи, но для нашего проекта так норм.
-    """
-    if not (SMTP_HOST and SMTP_PORT and SMTP_USER and SMTP_PASSWORD):
-        # Ничего не отправляем, если не настроено – чтобы не падало.
-        print("[send_email] SMTP не настроен, письмо не отправлено")
-        return
 
+def _queue_send_email(
+    to: str,
+    subject: str,
+    text: str,
+    *,
+    reply_to: Optional[str] = None,
+) -> None:
     msg = EmailMessage()
-    msg["From"] = SMTP_FROM
+    msg["From"] = SMTP.sender
     msg["To"] = to
     msg["Subject"] = subject
     if reply_to:
         msg["Reply-To"] = reply_to
     msg.set_content(text)
 
-    with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-        server.starttls()
-        server.login(SMTP_USER, SMTP_PASSWORD)
-        server.send_message(msg)
+    _queue.put_nowait(msg)
+
+
+# Ставит письмо в очередь на отправку. Настроен ли SMTP, решается один раз
+# при импорте, а не проверкой на каждый вызов.
+send_email = _queue_send_email if _CONFIGURED else _noop_send_email
+
+if not _CONFIGURED:
+    APP_LOGGER.warning("[send_email] SMTP is not configured, emails will not be sent")
+
+
+def start() -> None:
+    """Запускает воркеры отправки (при старте приложения)."""
+    if not _CONFIGURED:
+        return
+    for _ in range(_WORKERS):
+        _workers.append(asyncio.create_task(_email_worker()))
+
+
+async def aclose() -> None:
+    """
+    Досылает очередь, останавливает воркеры и закрывает соединения
+    (при остановке приложения).
+    """
+    try:
+        await asyncio.wait_for(_queue.join(), _DRAIN_TIMEOUT_SECONDS)
+    except TimeoutError:
+        APP_LOGGER.warning(
+            "[send_email] %s emails left unsent on shutdown", _queue.qsize()
+        )
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    while _idle:
+        await _close(_idle.pop())
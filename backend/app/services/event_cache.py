@@ -0,0 +1,97 @@
+# app/services/event_cache.py
+"""
+Короткий кеш публичной ленты событий внутри процесса.
+
+В ключ входит номер версии: любое изменение событий увеличивает его,
+и старые записи просто перестают читаться, доживая до истечения TTL.
+Ответ, посчитанный параллельно с изменением, ляжет под старым ключом
+и тоже не будет отдан.
+
+Ключ заполняется одним запросом: пока один запрос строит ответ, остальные
+с тем же ключом ждут его результат, а не идут в базу толпой.
+"""
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+# JSON-тело ответа и дополнительные заголовки
+CachedResponse = tuple[bytes, dict[str, str]]
+
+# blake2b(версия + параметры запроса) -> ответ
+_cache: TTLCache[bytes, CachedResponse] = TTLCache(
+    maxsize=settings.events_cache_maxsize,
+    ttl=settings.events_cache_ttl_seconds,
+)
+_version = 0
+
+# ключ -> результат заполнения, которое сейчас выполняется (None — не удалось)
+_inflight: dict[bytes, asyncio.Future[CachedResponse | None]] = {}
+
+# event_id -> (going, interested, canceled)
+_rsvp_stats: TTLCache[int, tuple[int, int, int]] = TTLCache(
+    maxsize=settings.events_cache_maxsize,
+    ttl=settings.rsvp_stats_cache_ttl_seconds,
+)
+
+
+def bump_version() -> None:
+    """Инвалидирует кеш после изменения любого события."""
+    global _version
+    _version += 1
+
+
+def make_key(*parts: object) -> bytes:
+    """Ключ кеша из текущей версии и параметров запроса."""
+    raw = repr((_version, *parts)).encode()
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+async def get_or_fill(
+    key: bytes, fill: Callable[[], Awaitable[CachedResponse]]
+) -> CachedResponse:
+    """
+    Ответ из кеша или результат fill(), посчитанный одним запросом на ключ.
+
+    Если заполнявший запрос упал, ожидавшие считают ответ сами — так
+    ошибка (в том числе 404 или отмена клиента) не размножается.
+    """
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    pending = _inflight.get(key)
+    if pending is not None:
+        shared = await asyncio.shield(pending)
+        if shared is not None:
+            return shared
+        return await fill()
+
+    future: asyncio.Future[CachedResponse | None] = (
+        asyncio.get_running_loop().create_future()
+    )
+    _inflight[key] = future
+    value: CachedResponse | None = None
+    try:
+        value = await fill()
+        _cache[key] = value
+        return value
+    finally:
+        del _inflight[key]
+        future.set_result(value)
+
+
+def get_rsvp_stats(event_id: int) -> tuple[int, int, int] | None:
+    return _rsvp_stats.get(event_id)
+
+
+def put_rsvp_stats(event_id: int, counts: tuple[int, int, int]) -> None:
+    _rsvp_stats[event_id] = counts
+
+
+def invalidate_rsvp_stats(event_id: int) -> None:
+    """Сбрасывает счётчики события после изменения RSVP."""
+    _rsvp_stats.pop(event_id, None)
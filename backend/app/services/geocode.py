@@ -0,0 +1,55 @@
+# app/services/geocode.py
+"""
+Обратное геокодирование через Nominatim с кешем в памяти процесса.
+
+Адрес — по сути функция координат, поэтому кешируем по точке,
+округлённой до 5 знаков (~1 м): повторные клики по карте не уходят
+во внешний сервис и не тратят его лимит запросов.
+"""
+import httpx
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+# Один клиент на процесс: соединение с Nominatim (DNS, TCP, TLS)
+# переиспользуется между запросами. Закрывается при остановке приложения.
+_client = httpx.AsyncClient(
+    base_url="https://nominatim.openstreetmap.org",
+    timeout=5,
+    headers={"User-Agent": "pulse-afisha/1.0"},
+    limits=httpx.Limits(max_keepalive_connections=20),
+)
+
+# (lat, lng) с округлением -> адрес
+_cache: TTLCache[tuple[float, float], str] = TTLCache(
+    maxsize=settings.geocode_cache_maxsize,
+    ttl=settings.geocode_cache_ttl_seconds,
+)
+
+
+async def reverse_geocode(lat: float, lng: float) -> str | None:
+    """Адрес по координатам или None, если сервис недоступен."""
+    key = (round(lat, 5), round(lng, 5))
+    address = _cache.get(key)
+    if address is not None:
+        return address
+
+    try:
+        resp = await _client.get(
+            "/reverse",
+            params={"format": "jsonv2", "lat": key[0], "lon": key[1]},
+        )
+        resp.raise_for_status()
+        address = resp.json().get("display_name")
+    except Exception:
+        return None
+
+    # ошибки не кешируем — следующий запрос попробует снова
+    if address is not None:
+        _cache[key] = address
+    return address
+
+
+async def aclose() -> None:
+    """Закрывает HTTP-клиент (при остановке приложения)."""
+    await _client.aclose()
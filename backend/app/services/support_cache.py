@@ -0,0 +1,40 @@
+# app/services/support_cache.py
+"""
+Короткий кеш списка всех обращений для админки внутри процесса.
+
+Админка опрашивает список часто, а меняется он редко. Как и в кеше
+ленты событий, в ключ входит номер версии: создание, ответ, закрытие
+или удаление обращения увеличивает его, и старый ответ больше не читается.
+Список пользователя (/my) здесь не кешируется.
+"""
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+# (версия, фильтр, limit, offset) -> JSON-тело списка
+_cache: TTLCache[tuple[object, ...], bytes] = TTLCache(
+    maxsize=64,
+    ttl=settings.support_admin_cache_ttl_seconds,
+)
+_version = 0
+
+
+def bump_version() -> None:
+    """Инвалидирует кеш после изменения любого обращения."""
+    global _version
+    _version += 1
+
+
+def current_version() -> int:
+    """Версия, под которой сохранять ответ, посчитанный с этого момента."""
+    return _version
+
+
+def get_admin_list(params: tuple[object, ...]) -> bytes | None:
+    return _cache.get((_version, *params))
+
+
+def put_admin_list(version: int, params: tuple[object, ...], body: bytes) -> None:
+    # ответ, посчитанный параллельно с изменением, под новую версию не попадёт
+    if version == _version:
+        _cache[(version, *params)] = body